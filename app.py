@@ -1,17 +1,11 @@
 import streamlit as st
-import numpy as np
-import pandas as pd
-import yfinance as yf
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
 import warnings
-import json
 import os
 import re
-import hashlib
-from scipy.optimize import minimize
+from riskovian import passwords as password_hashing
+from riskovian import users as user_store
+from riskovian.theme import COLOR_SCHEME
 
 warnings.filterwarnings('ignore')
 
@@ -26,25 +20,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ============================================================================
-# INSTITUTIONAL COLOR SCHEME
-# ============================================================================
-
-COLOR_SCHEME = {
-    'primary': '#1E40AF',           
-    'primary_dark': '#1E3A8A',      
-    'primary_light': '#3B82F6',     
-    'secondary': '#0891B2',         
-    'accent': '#DC2626',            
-    'success': '#059669',           
-    'warning': '#F59E0B',           
-    'background': '#F8FAFC',        
-    'surface': '#FFFFFF',           
-    'border': '#E2E8F0',            
-    'text_primary': '#1E293B',      
-    'text_secondary': '#64748B',    
-}
-
 # ============================================================================
 # PROFESSIONAL CSS STYLING
 # ============================================================================
@@ -305,22 +280,51 @@ st.markdown(f"""
 # ============================================================================
 
 USERS_FILE = "users_data.json"
+USERS_DB = "users.db"
+
+# User store backend: 'sqlite' keeps users in USERS_DB and imports USERS_FILE
+# the first time it is opened; 'json' reads and writes USERS_FILE directly.
+USER_STORE = os.environ.get("RISKOVIAN_USER_STORE", "sqlite")
 
 def hash_password(password):
-    """Hash password using SHA256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with a per-user salt on the shared hashing pool."""
+    return password_hashing.get_hashing_pool().submit(password_hashing.hash_password, password).result()
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored hash on the shared hashing pool."""
+    return password_hashing.get_hashing_pool().submit(
+        password_hashing.verify_password, password, stored_hash
+    ).result()
+
+def user_database():
+    """Return the SQLite user database path, migrating USERS_FILE on first use."""
+    user_store.migrate_json_users(USERS_DB, USERS_FILE)
+    return USERS_DB
 
 def load_users():
-    """Load registered users from JSON file."""
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    """Load all registered users as a dict of email -> record."""
+    if USER_STORE == 'sqlite':
+        return user_store.load_users(user_database())
+    return user_store.load_json_users(USERS_FILE)
+
+def get_user(email):
+    """Return one user's record, or None if the email is not registered."""
+    if USER_STORE == 'sqlite':
+        return user_store.get_user(user_database(), email)
+    return user_store.get_json_user(USERS_FILE, email)
+
+def update_password(email, password_hash):
+    """Replace a registered user's stored password hash."""
+    if USER_STORE == 'sqlite':
+        user_store.set_password(user_database(), email, password_hash)
+    else:
+        user_store.set_json_password(USERS_FILE, email, password_hash)
 
-def save_users(users):
-    """Save users to JSON file."""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=4)
+def add_user(email, record):
+    """Store a new user; returns False if the email is already registered."""
+    if USER_STORE == 'sqlite':
+        return user_store.add_user(user_database(), email, record)
+    return user_store.add_json_user(USERS_FILE, email, record)
 
 def validate_email(email):
     """Validate email format."""
@@ -339,8 +343,7 @@ def validate_password(password):
 
 def register_user(email, password, fullname):
     """Register a new user."""
-    users = load_users()
-    if email in users:
+    if get_user(email) is not None:
         return False, "Email already registered!"
     
     is_valid, msg = validate_password(password)
@@ -350,23 +353,29 @@ def register_user(email, password, fullname):
     if not validate_email(email):
         return False, "Invalid email format!"
     
-    users[email] = {
+    record = {
         "password": hash_password(password),
         "fullname": fullname,
         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    save_users(users)
+    if not add_user(email, record):
+        return False, "Email already registered!"
     return True, "Account created successfully! Please login."
 
 def login_user(email, password):
     """Authenticate user login."""
-    users = load_users()
-    if email not in users:
+    user = get_user(email)
+    if user is None:
         return False, "Email not found!"
     
-    if users[email]["password"] != hash_password(password):
+    if not verify_password(password, user["password"]):
         return False, "Incorrect password!"
     
+    # Upgrade legacy SHA-256 hashes and outdated cost parameters while the
+    # plaintext password is at hand.
+    if password_hashing.needs_rehash(user["password"]):
+        update_password(email, hash_password(password))
+    
     return True, "Login successful!"
 
 # Initialize session state
@@ -647,8 +656,7 @@ def show_login_page():
                     if success:
                         st.session_state.authenticated = True
                         st.session_state.user_email = email
-                        users = load_users()
-                        st.session_state.user_name = users[email]["fullname"]
+                        st.session_state.user_name = get_user(email)["fullname"]
                         st.success("✅ " + message)
                         st.balloons()
                         st.rerun()
@@ -905,69 +913,97 @@ if not st.session_state.authenticated:
     st.stop()
 
 # ============================================================================
-# ASSET DATABASE & PORTFOLIO STRATEGIES
+# DASHBOARD DEPENDENCIES
 # ============================================================================
+# Imported only after sign-in so the login and signup pages render without
+# loading the numerical and plotting stack. yfinance and scipy are imported
+# inside the only functions that use them.
 
-ASSET_DATABASE = {
-    'NIFTY 50': '^NSEI',
-    'NIFTY IT': '^CNXIT',
-    'NIFTY MIDCAP 50': '^NSMID50',
-    'Government Bonds': 'GILT.NS',
-    'Gold ETF': '^NSEINDEXG',
-    'Bank NIFTY': '^NSEBANK',
-    'PSU Stocks': '^CNXINFRA',
-    'NIFTY 100': '^NSEI',
-}
-
-PORTFOLIO_STRATEGIES = {
-    'Conservative': {
-        'description': 'Low risk, stable returns. Suitable for retirees and risk-averse investors.',
-        'allocation': {'GILT.NS': 0.70, '^NSEI': 0.25, '^NSEINDEXG': 0.05},
-        'expected_return': 0.065,
-        'volatility': 0.08
-    },
-    'Moderate': {
-        'description': 'Balanced approach. Suitable for long-term investors with moderate risk tolerance.',
-        'allocation': {'^NSEI': 0.50, 'GILT.NS': 0.40, '^NSMID50': 0.05, '^NSEINDEXG': 0.05},
-        'expected_return': 0.095,
-        'volatility': 0.12
-    },
-    'Aggressive': {
-        'description': 'Growth-focused. Suitable for investors with high risk tolerance and longer time horizons.',
-        'allocation': {'^NSEI': 0.35, '^CNXIT': 0.30, '^NSMID50': 0.20, '^NSEBANK': 0.15},
-        'expected_return': 0.140,
-        'volatility': 0.18
-    },
-    'Growth': {
-        'description': 'Emphasizes capital appreciation through Indian equities.',
-        'allocation': {'^CNXIT': 0.35, '^NSEI': 0.35, '^NSMID50': 0.20, '^NSEINDEXG': 0.10},
-        'expected_return': 0.125,
-        'volatility': 0.16
-    },
-    'Income': {
-        'description': 'Focus on stable income through bonds and dividend stocks.',
-        'allocation': {'GILT.NS': 0.50, '^NSEBANK': 0.30, '^NSEI': 0.15, '^NSEINDEXG': 0.05},
-        'expected_return': 0.080,
-        'volatility': 0.09
-    }
-}
+import pandas as pd
+from riskovian import analytics, charts, market_data, projections, strategies
+from riskovian.market_data import get_date_range
+from riskovian.projections import (
+    BOOTSTRAP_BLOCK_MONTHS,
+    COMPARISON_MAX_SIMULATIONS,
+    MONTE_CARLO_MODELS,
+    REBALANCE_FREQUENCIES,
+)
+from riskovian.strategies import ASSET_DATABASE, PORTFOLIO_STRATEGIES, get_strategy_assumptions
+
+# ============================================================================
+# DASHBOARD SETTINGS
+# ============================================================================
+
+# Random portfolio cloud behind the efficient frontier; portfolios are binned
+# on a RANDOM_PORTFOLIO_BINS x RANDOM_PORTFOLIO_BINS grid before plotting.
+RANDOM_PORTFOLIO_COUNT = 100000
+RANDOM_PORTFOLIO_BINS = 80
+
+SIMULATION_COUNTS = [1000, 10000, 100000, 1000000]
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
-@st.cache_data(ttl=3600)
-def fetch_asset_data(ticker, years=5):
-    """Fetch historical asset data."""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365*years)
-        data = yf.download(ticker, start=start_date, end=end_date, progress=False, quiet=True)
-        if data is None or data.empty:
-            return None
-        return data['Adj Close']
-    except:
+# The analytics live in the headless ``riskovian`` package; these wrappers add
+# Streamlit caching keyed on the ticker set and date range.
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_price_matrix(tickers, start_date, end_date):
+    """Load the aligned price matrix for a ticker set from the local price store."""
+    return market_data.load_price_matrix(tickers, start_date, end_date)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_return_statistics(tickers, start_date, end_date):
+    """Compute the cached return statistics of a ticker set."""
+    return analytics.compute_return_statistics(fetch_price_matrix(tickers, start_date, end_date))
+
+def load_return_statistics(tickers, years=5):
+    """Load the cached return statistics for a collection of tickers."""
+    start_date, end_date = get_date_range(years)
+    return compute_return_statistics(tuple(sorted(set(tickers))), start_date, end_date)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def compute_strategy_analytics(strategy_configs, start_date, end_date, risk_free_rate=0.0):
+    """Compute the cached realized analytics of several strategies."""
+    return_stats = compute_return_statistics(strategies.strategy_tickers(strategy_configs),
+                                             start_date, end_date)
+    return analytics.compute_strategy_analytics(return_stats, strategy_configs, risk_free_rate)
+
+def load_strategy_analytics(years=5):
+    """Load the cached realized analytics of all PORTFOLIO_STRATEGIES."""
+    start_date, end_date = get_date_range(years)
+    return compute_strategy_analytics(PORTFOLIO_STRATEGIES, start_date, end_date)
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def build_performance_figure(tickers, start_date, end_date, width=charts.PERFORMANCE_CHART_WIDTH):
+    """Build the normalized performance chart.
+
+    The figure object is cached by ticker set and date range and shared
+    between sessions without being copied, so it must not be modified.
+    Reruns skip the build and only pay for Streamlit serializing it. Returns
+    None if any ticker has no data.
+    """
+    prices = fetch_price_matrix(tickers, start_date, end_date)
+    if prices is None or any(ticker not in prices for ticker in tickers):
         return None
+    return charts.performance_figure(prices, tickers, width)
+
+def load_performance_figure(tickers, years=5):
+    """Return the cached performance chart for a collection of tickers."""
+    start_date, end_date = get_date_range(years)
+    return build_performance_figure(tuple(sorted(set(tickers))), start_date, end_date)
+
+def get_strategy_data(strategy_name):
+    """Return a strategy's configuration with realized return and volatility."""
+    return strategies.get_strategy_data(strategy_name, load_strategy_analytics(years=5))
+
+# Monte Carlo summaries hold only percentile bands, final values and a few
+# sample paths, so they are cheap to keep in the cache.
+project_portfolio = st.cache_data(max_entries=32, show_spinner=False)(projections.project_portfolio)
+run_strategy_comparison = st.cache_data(max_entries=32, show_spinner=False)(projections.run_strategy_comparison)
+compute_efficient_frontier = st.cache_data(max_entries=16, show_spinner=False)(analytics.compute_efficient_frontier)
+generate_random_portfolios = st.cache_data(max_entries=16, show_spinner=False)(analytics.generate_random_portfolios)
 
 def create_metric_card(label, value, change=None, color="primary"):
     """Create a professional metric card."""
@@ -998,6 +1034,330 @@ def create_dashboard_header(title, subtitle=""):
         </div>
     """, unsafe_allow_html=True)
 
+# ============================================================================
+# DASHBOARD SECTIONS
+# ============================================================================
+# Each section is a fragment, so a widget inside it (the Monte Carlo horizon,
+# contribution, model, rebalancing and simulation count) reruns only that
+# section. Inputs shared by several sections (strategy and investment amount)
+# live in the sidebar and are passed as arguments. Changing one of them reruns
+# the whole script and so every section, including those that do not use it;
+# the caches above keep those reruns cheap.
+
+@st.fragment
+def render_allocation_section(strategy, investment_amount):
+    """Render the portfolio overview cards and the recommended allocation."""
+    # Portfolio Overview Section
+    st.markdown("### 📊 Portfolio Overview")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    strategy_data = get_strategy_data(strategy)
+
+    with col1:
+        create_metric_card("Expected Return", f"{strategy_data['expected_return']*100:.1f}%", color="primary")
+
+    with col2:
+        create_metric_card("Annual Volatility", f"{strategy_data['volatility']*100:.1f}%", color="secondary")
+
+    with col3:
+        create_metric_card("Investment Amount", f"₹{investment_amount:,.0f}", color="success")
+
+    with col4:
+        create_metric_card("Portfolio Assets", str(len(strategy_data['allocation'])), color="warning")
+
+    st.markdown("")
+
+    # Asset Allocation Section
+    st.markdown("### 💼 Recommended Asset Allocation")
+
+    col_alloc, col_comp = st.columns([1, 1])
+
+    with col_alloc:
+        # Pie Chart using Plotly
+        allocation = strategy_data['allocation']
+        st.plotly_chart(charts.allocation_figure(allocation), use_container_width=True)
+
+    with col_comp:
+        # Allocation Table
+        allocation_data = []
+        for ticker, weight in allocation.items():
+            allocation_data.append({
+                'Asset': ticker,
+                'Weight': f"{weight*100:.1f}%",
+                'Amount': f"${investment_amount*weight:,.0f}"
+            })
+    
+        allocation_df = pd.DataFrame(allocation_data)
+        st.dataframe(allocation_df, use_container_width=True, height=400, hide_index=True)
+
+@st.fragment
+def render_performance_section(strategy):
+    """Render the normalized historical performance chart."""
+    # Asset Performance Section
+    st.markdown("### 📈 Historical Performance Analysis")
+
+    with st.spinner("📥 Loading market data..."):
+        performance_figure = load_performance_figure(PORTFOLIO_STRATEGIES[strategy]['allocation'].keys(), years=5)
+
+    if performance_figure is not None:
+        st.plotly_chart(performance_figure, use_container_width=True)
+
+@st.fragment
+def render_monte_carlo_section(strategy, investment_amount):
+    """Render the Monte Carlo projection, its statistics and the strategy fan chart."""
+    # Monte Carlo Simulation
+    st.markdown("### 🎲 Monte Carlo Simulation - Retirement Projections")
+
+    strategy_data = get_strategy_data(strategy)
+    strategy_analytics = load_strategy_analytics(years=5)
+    return_stats = load_return_statistics(strategy_data['allocation'].keys(), years=5)
+    
+    col_horizon, col_contribution = st.columns(2)
+    
+    with col_horizon:
+        investment_horizon = st.number_input(
+            "Investment Horizon (Years)",
+            min_value=1,
+            max_value=50,
+            value=20,
+        )
+    
+    with col_contribution:
+        monthly_contribution = st.number_input(
+            "Monthly Contribution (₹)",
+            min_value=0.0,
+            max_value=500000.0,
+            value=10000.0,
+            step=1000.0,
+        )
+
+    col_model1, col_model2, col_model3 = st.columns([2, 1, 1])
+
+    with col_model1:
+        simulation_model = st.radio(
+            "Simulation Model",
+            MONTE_CARLO_MODELS,
+            horizontal=True,
+            help="Parametric treats the portfolio as one normal variable; Correlated Assets "
+                 "simulates each asset with its historical covariance and rebalances periodically; "
+                 "Historical Bootstrap replays blocks of actual monthly returns"
+        )
+
+    with col_model2:
+        rebalance_frequency = st.selectbox(
+            "Rebalancing",
+            list(REBALANCE_FREQUENCIES.keys()),
+            index=2,
+            disabled=simulation_model != 'Correlated Assets'
+        )
+
+    with col_model3:
+        num_simulations = st.select_slider(
+            "Simulations",
+            options=SIMULATION_COUNTS,
+            value=SIMULATION_COUNTS[0],
+            format_func=lambda count: f"{count:,}"
+        )
+
+    if not projections.model_available(simulation_model, strategy_data['allocation'], return_stats):
+        st.info("Market data is unavailable, so the parametric model is used instead.")
+        simulation_model = 'Parametric'
+
+    tab1, tab2, tab3 = st.tabs(["Projection", "Statistics", "Compare Strategies"])
+
+    with tab1:
+        col_sim1, col_sim2 = st.columns([3, 1])
+    
+        with col_sim1:
+            with st.spinner(f"⏳ Running {num_simulations:,} Monte Carlo simulations..."):
+                simulation = project_portfolio(
+                    simulation_model,
+                    strategy_data['allocation'],
+                    strategy_data['expected_return'],
+                    strategy_data['volatility'],
+                    investment_amount,
+                    investment_horizon,
+                    monthly_contribution,
+                    annual_returns=None if return_stats is None else return_stats['annual_return'],
+                    covariance=None if return_stats is None else return_stats['covariance'],
+                    monthly_returns=None if return_stats is None else return_stats['monthly_returns'],
+                    num_simulations=num_simulations,
+                    seed=42,
+                    rebalance_months=REBALANCE_FREQUENCIES[rebalance_frequency],
+                    block_months=BOOTSTRAP_BLOCK_MONTHS
+                )
+                final_values = simulation['final_values']
+
+                # Plot trajectories
+                st.plotly_chart(charts.projection_figure(simulation, investment_horizon),
+                                use_container_width=True)
+
+    with tab2:
+        # Statistics
+        stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+    
+        with stat_col1:
+            create_metric_card(
+                "5th Percentile",
+                f"${simulation['percentiles'][5][-1]:,.0f}",
+                ((simulation['percentiles'][5][-1] / investment_amount - 1) * 100),
+                "accent"
+            )
+    
+        with stat_col2:
+            create_metric_card(
+                "Median (50th)",
+                f"${simulation['percentiles'][50][-1]:,.0f}",
+                ((simulation['percentiles'][50][-1] / investment_amount - 1) * 100),
+                "primary"
+            )
+    
+        with stat_col3:
+            create_metric_card(
+                "95th Percentile",
+                f"${simulation['percentiles'][95][-1]:,.0f}",
+                ((simulation['percentiles'][95][-1] / investment_amount - 1) * 100),
+                "success"
+            )
+    
+        with stat_col4:
+            create_metric_card(
+                "Expected Value",
+                f"${simulation['expected_value']:,.0f}",
+                ((simulation['expected_value'] / investment_amount - 1) * 100)
+            )
+    
+        st.markdown("")
+    
+        # Distribution
+        st.plotly_chart(charts.distribution_figure(final_values), use_container_width=True)
+
+    with tab3:
+        # All strategies simulated together on shared draws
+        strategy_names = list(PORTFOLIO_STRATEGIES.keys())
+        strategy_assumptions = [get_strategy_assumptions(name, strategy_analytics) for name in strategy_names]
+        comparison_simulations = min(num_simulations, COMPARISON_MAX_SIMULATIONS)
+        if comparison_simulations < num_simulations:
+            st.caption(f"Strategies are compared on {comparison_simulations:,} simulations.")
+    
+        with st.spinner("⏳ Simulating all strategies..."):
+            comparison = run_strategy_comparison(
+                investment_amount,
+                investment_horizon,
+                monthly_contribution,
+                tuple(float(ret) for ret, _ in strategy_assumptions),
+                tuple(float(vol) for _, vol in strategy_assumptions),
+                num_simulations=comparison_simulations,
+                seed=42
+            )
+    
+        st.plotly_chart(charts.strategy_comparison_figure(comparison, strategy_names, investment_horizon),
+                        use_container_width=True)
+    
+        projection_df = pd.DataFrame({
+            'Strategy': strategy_names,
+            '5th Percentile': [f"${v:,.0f}" for v in comparison['percentiles'][5][:, -1]],
+            'Median': [f"${v:,.0f}" for v in comparison['percentiles'][50][:, -1]],
+            '95th Percentile': [f"${v:,.0f}" for v in comparison['percentiles'][95][:, -1]],
+            'Expected Value': [f"${v:,.0f}" for v in comparison['expected_value']],
+            'Chance Below Invested': [f"{p*100:.1f}%" for p in comparison['probability_below']]
+        })
+        st.dataframe(projection_df, use_container_width=True, hide_index=True)
+
+@st.fragment
+def render_risk_analysis_section(strategy):
+    """Render the correlation matrix and the risk-return profile."""
+    # Risk Analysis Section
+    st.markdown("### 📊 Risk Analysis")
+
+    strategy_data = get_strategy_data(strategy)
+    return_stats = load_return_statistics(strategy_data['allocation'].keys(), years=5)
+
+    col_risk1, col_risk2 = st.columns([1, 1])
+
+    with col_risk1:
+        # Correlation Matrix
+        if return_stats is not None:
+            corr_matrix = return_stats['correlation']
+            if not corr_matrix.empty:
+                st.plotly_chart(charts.correlation_figure(corr_matrix), use_container_width=True)
+
+    with col_risk2:
+        # Risk-Return Scatter
+        if return_stats is not None:
+            st.plotly_chart(charts.risk_return_figure(return_stats, strategy_data), use_container_width=True)
+
+@st.fragment
+def render_comparison_section():
+    """Render the efficient frontier and the strategy comparison table."""
+    # Efficient Frontier
+    st.markdown("### 🧭 Efficient Frontier")
+
+    universe_stats = load_return_statistics(ASSET_DATABASE.values(), years=5)
+
+    if universe_stats is not None and len(universe_stats['annual_return']) > 1:
+        universe_tickers = list(universe_stats['annual_return'].index)
+        frontier = compute_efficient_frontier(
+            universe_stats['annual_return'].to_numpy(),
+            universe_stats['covariance'].to_numpy()
+        )
+        random_portfolios = generate_random_portfolios(
+            universe_stats['annual_return'].to_numpy(),
+            universe_stats['covariance'].to_numpy(),
+            num_portfolios=RANDOM_PORTFOLIO_COUNT,
+            bins=RANDOM_PORTFOLIO_BINS
+        )
+    
+        col_front1, col_front2 = st.columns([2, 1])
+    
+        with col_front1:
+            st.plotly_chart(
+                charts.frontier_figure(universe_stats, frontier, random_portfolios, RANDOM_PORTFOLIO_COUNT),
+                use_container_width=True
+            )
+    
+        with col_front2:
+            frontier_df = pd.DataFrame({
+                'Asset': universe_tickers,
+                'Min Variance': [f"{w*100:.1f}%" for w in frontier['min_variance']['weights']],
+                'Max Sharpe': [f"{w*100:.1f}%" for w in frontier['max_sharpe']['weights']]
+            })
+            st.dataframe(frontier_df, use_container_width=True, height=450, hide_index=True)
+
+    st.markdown("")
+
+    # Strategy Comparison
+    st.markdown("### 🔗 Strategy Comparison")
+
+    strategy_analytics = load_strategy_analytics(years=5)
+
+    comparison_data = []
+    for strat_name, strat_config in PORTFOLIO_STRATEGIES.items():
+        if strategy_analytics is not None and strategy_analytics.loc[strat_name].notna().all():
+            realized = strategy_analytics.loc[strat_name]
+            comparison_data.append({
+                'Strategy': strat_name,
+                'Return': f"{realized['return']*100:.1f}%",
+                'Volatility': f"{realized['volatility']*100:.1f}%",
+                'Sharpe Ratio': f"{realized['sharpe']:.2f}",
+                'Max Drawdown': f"{realized['max_drawdown']*100:.1f}%",
+                'Assets': len(strat_config['allocation'])
+            })
+        else:
+            sharpe = strat_config['expected_return'] / strat_config['volatility']
+            comparison_data.append({
+                'Strategy': strat_name,
+                'Return': f"{strat_config['expected_return']*100:.1f}%",
+                'Volatility': f"{strat_config['volatility']*100:.1f}%",
+                'Sharpe Ratio': f"{sharpe:.2f}",
+                'Max Drawdown': "—",
+                'Assets': len(strat_config['allocation'])
+            })
+
+    comparison_df = pd.DataFrame(comparison_data)
+    st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+
 # ============================================================================
 # SIDEBAR CONFIGURATION
 # ============================================================================
@@ -1040,21 +1400,6 @@ with st.sidebar:
         value=500000.0,
         step=50000.0,
     )
-    
-    investment_horizon = st.number_input(
-        "Investment Horizon (Years)",
-        min_value=1,
-        max_value=50,
-        value=20,
-    )
-    
-    monthly_contribution = st.number_input(
-        "Monthly Contribution (₹)",
-        min_value=0.0,
-        max_value=500000.0,
-        value=10000.0,
-        step=1000.0,
-    )
 
 # ============================================================================
 # MAIN CONTENT
@@ -1065,421 +1410,15 @@ create_dashboard_header(
     f"Personalized portfolio management for {st.session_state.user_name} | {st.session_state.risk_profile} Strategy"
 )
 
-# Portfolio Overview Section
-st.markdown("### 📊 Portfolio Overview")
-
-col1, col2, col3, col4 = st.columns(4)
-
-strategy_data = PORTFOLIO_STRATEGIES[st.session_state.risk_profile]
-
-with col1:
-    create_metric_card("Expected Return", f"{strategy_data['expected_return']*100:.1f}%", color="primary")
-
-with col2:
-    create_metric_card("Annual Volatility", f"{strategy_data['volatility']*100:.1f}%", color="secondary")
-
-with col3:
-    create_metric_card("Investment Amount", f"₹{investment_amount:,.0f}", color="success")
-
-with col4:
-    create_metric_card("Portfolio Assets", str(len(strategy_data['allocation'])), color="warning")
-
+render_allocation_section(strategy, investment_amount)
 st.markdown("")
-
-# Asset Allocation Section
-st.markdown("### 💼 Recommended Asset Allocation")
-
-col_alloc, col_comp = st.columns([1, 1])
-
-with col_alloc:
-    # Pie Chart using Plotly
-    allocation = strategy_data['allocation']
-    fig_pie = go.Figure(data=[go.Pie(
-        labels=list(allocation.keys()),
-        values=list(allocation.values()),
-        hole=0,
-        textposition="inside",
-        textinfo="label+percent",
-        hovertemplate="<b>%{label}</b><br>%{value:.1%}<extra></extra>",
-        marker=dict(
-            colors=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary'], 
-                   COLOR_SCHEME['success'], COLOR_SCHEME['warning']],
-            line=dict(color=COLOR_SCHEME['surface'], width=2)
-        )
-    )])
-    fig_pie.update_layout(
-        height=400,
-        showlegend=True,
-        margin=dict(t=0, b=0, l=0, r=0),
-        paper_bgcolor=COLOR_SCHEME['background'],
-        plot_bgcolor=COLOR_SCHEME['background'],
-        font=dict(family="Inter", color=COLOR_SCHEME['text_primary'])
-    )
-    st.plotly_chart(fig_pie, use_container_width=True)
-
-with col_comp:
-    # Allocation Table
-    allocation_data = []
-    for ticker, weight in allocation.items():
-        allocation_data.append({
-            'Asset': ticker,
-            'Weight': f"{weight*100:.1f}%",
-            'Amount': f"${investment_amount*weight:,.0f}"
-        })
-    
-    allocation_df = pd.DataFrame(allocation_data)
-    st.dataframe(allocation_df, use_container_width=True, height=400, hide_index=True)
-
-st.markdown("")
-
-# Asset Performance Section
-st.markdown("### 📈 Historical Performance Analysis")
-
-# Load data for selected assets
-with st.spinner("📥 Loading market data..."):
-    prices_data = {}
-    for ticker in strategy_data['allocation'].keys():
-        prices_data[ticker] = fetch_asset_data(ticker, years=5)
-
-# Create performance chart
-if all(prices is not None for prices in prices_data.values()):
-    fig_perf = go.Figure()
-    
-    for ticker, prices in prices_data.items():
-        normalized = (prices / prices.iloc[0]) * 100
-        fig_perf.add_trace(go.Scatter(
-            x=normalized.index,
-            y=normalized.values,
-            name=ticker,
-            mode='lines',
-            line=dict(width=2.5),
-            hovertemplate="<b>%{fullData.name}</b><br>%{x|%Y-%m-%d}<br>%{y:.2f}<extra></extra>"
-        ))
-    
-    fig_perf.update_layout(
-        title="Normalized Asset Performance (5-Year Period)",
-        xaxis_title="Date",
-        yaxis_title="Indexed Value (Base = 100)",
-        hovermode="x unified",
-        height=450,
-        template="plotly_white",
-        paper_bgcolor=COLOR_SCHEME['background'],
-        plot_bgcolor=COLOR_SCHEME['surface'],
-        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        margin=dict(t=60, b=60, l=60, r=60)
-    )
-    
-    st.plotly_chart(fig_perf, use_container_width=True)
-
+render_performance_section(strategy)
 st.markdown("")
-
-# Monte Carlo Simulation
-st.markdown("### 🎲 Monte Carlo Simulation - Retirement Projections")
-
-tab1, tab2 = st.tabs(["Projection", "Statistics"])
-
-with tab1:
-    col_sim1, col_sim2 = st.columns([3, 1])
-    
-    with col_sim1:
-        with st.spinner("⏳ Running 1,000 Monte Carlo simulations..."):
-            np.random.seed(42)
-            num_simulations = 1000
-            num_months = investment_horizon * 12
-            
-            daily_return = strategy_data['expected_return'] / 252
-            daily_volatility = strategy_data['volatility'] / np.sqrt(252)
-            
-            final_values = []
-            paths = np.zeros((num_months, num_simulations))
-            
-            for sim in range(num_simulations):
-                portfolio_value = investment_amount
-                for month in range(num_months):
-                    # Add monthly contribution
-                    portfolio_value += monthly_contribution
-                    
-                    # Generate monthly return
-                    monthly_ret = np.random.normal(daily_return * 21, daily_volatility * np.sqrt(21))
-                    portfolio_value *= (1 + monthly_ret)
-                    
-                    paths[int(month), sim] = portfolio_value
-                
-                final_values.append(portfolio_value)
-            
-            final_values = np.array(final_values)
-            
-            # Create percentile paths
-            percentile_5 = np.percentile(paths, 5, axis=1)
-            percentile_50 = np.percentile(paths, 50, axis=1)
-            percentile_95 = np.percentile(paths, 95, axis=1)
-            
-            # Plot trajectories
-            fig_mc = go.Figure()
-            
-            # Add sample paths (transparent)
-            for sim in range(min(100, num_simulations)):
-                fig_mc.add_trace(go.Scatter(
-                    x=np.arange(num_months),
-                    y=paths[:, sim],
-                    mode='lines',
-                    line=dict(color=COLOR_SCHEME['primary'], width=0.5),
-                    opacity=0.05,
-                    hoverinfo='skip',
-                    showlegend=False
-                ))
-            
-            # Add percentile lines
-            months = np.arange(num_months)
-            
-            fig_mc.add_trace(go.Scatter(
-                x=months,
-                y=percentile_95,
-                fill=None,
-                mode='lines',
-                name='95th Percentile (Best Case)',
-                line=dict(color=COLOR_SCHEME['success'], width=2, dash='dash'),
-                hovertemplate="95th: $%{y:,.0f}<extra></extra>"
-            ))
-            
-            fig_mc.add_trace(go.Scatter(
-                x=months,
-                y=percentile_50,
-                fill='tonexty',
-                mode='lines',
-                name='50th Percentile (Median)',
-                line=dict(color=COLOR_SCHEME['primary'], width=3),
-                fillcolor=f"rgba(30, 64, 175, 0.2)",
-                hovertemplate="Median: $%{y:,.0f}<extra></extra>"
-            ))
-            
-            fig_mc.add_trace(go.Scatter(
-                x=months,
-                y=percentile_5,
-                fill='tonexty',
-                mode='lines',
-                name='5th Percentile (Worst Case)',
-                line=dict(color=COLOR_SCHEME['accent'], width=2, dash='dash'),
-                fillcolor=f"rgba(220, 38, 38, 0.1)",
-                hovertemplate="5th: $%{y:,.0f}<extra></extra>"
-            ))
-            
-            fig_mc.update_layout(
-                title=f"Projected Portfolio Value Over {investment_horizon} Years",
-                xaxis_title="Months",
-                yaxis_title="Portfolio Value ($)",
-                height=500,
-                template="plotly_white",
-                hovermode="x unified",
-                paper_bgcolor=COLOR_SCHEME['background'],
-                plot_bgcolor=COLOR_SCHEME['surface'],
-                font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
-                yaxis=dict(tickformat="$,"),
-                margin=dict(t=60, b=60, l=80, r=60)
-            )
-            
-            st.plotly_chart(fig_mc, use_container_width=True)
-
-with tab2:
-    # Statistics
-    stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
-    
-    with stat_col1:
-        create_metric_card(
-            "5th Percentile",
-            f"${np.percentile(final_values, 5):,.0f}",
-            ((np.percentile(final_values, 5) / investment_amount - 1) * 100),
-            "accent"
-        )
-    
-    with stat_col2:
-        create_metric_card(
-            "Median (50th)",
-            f"${np.percentile(final_values, 50):,.0f}",
-            ((np.percentile(final_values, 50) / investment_amount - 1) * 100),
-            "primary"
-        )
-    
-    with stat_col3:
-        create_metric_card(
-            "95th Percentile",
-            f"${np.percentile(final_values, 95):,.0f}",
-            ((np.percentile(final_values, 95) / investment_amount - 1) * 100),
-            "success"
-        )
-    
-    with stat_col4:
-        create_metric_card(
-            "Expected Value",
-            f"${np.mean(final_values):,.0f}",
-            ((np.mean(final_values) / investment_amount - 1) * 100)
-        )
-    
-    st.markdown("")
-    
-    # Distribution
-    fig_dist = go.Figure()
-    fig_dist.add_trace(go.Histogram(
-        x=final_values,
-        nbinsx=50,
-        name="Simulation Results",
-        marker=dict(color=COLOR_SCHEME['primary']),
-        hovertemplate="Portfolio Value: $%{x:,.0f}<br>Frequency: %{y}<extra></extra>"
-    ))
-    
-    fig_dist.update_layout(
-        title="Distribution of Final Portfolio Values",
-        xaxis_title="Final Portfolio Value ($)",
-        yaxis_title="Frequency",
-        height=400,
-        template="plotly_white",
-        paper_bgcolor=COLOR_SCHEME['background'],
-        plot_bgcolor=COLOR_SCHEME['surface'],
-        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
-        xaxis=dict(tickformat="$,"),
-        margin=dict(t=60, b=60, l=80, r=60),
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig_dist, use_container_width=True)
-
+render_monte_carlo_section(strategy, investment_amount)
 st.markdown("")
-
-# Risk Analysis Section
-st.markdown("### 📊 Risk Analysis")
-
-col_risk1, col_risk2 = st.columns([1, 1])
-
-with col_risk1:
-    # Correlation Matrix
-    if all(prices is not None for prices in prices_data.values()):
-        returns_dict = {}
-        for ticker, prices in prices_data.items():
-            if len(prices) > 1:
-                returns_dict[ticker] = prices.pct_change().dropna()
-        
-        if returns_dict:
-            returns_df = pd.DataFrame(returns_dict)
-            corr_matrix = returns_df.corr()
-            
-            fig_corr = go.Figure(data=go.Heatmap(
-                z=corr_matrix.values,
-                x=corr_matrix.columns,
-                y=corr_matrix.columns,
-                colorscale='RdYlGn',
-                zmid=0,
-                zmin=-1,
-                zmax=1,
-                text=np.round(corr_matrix.values, 2),
-                texttemplate='%{text:.2f}',
-                textfont={"size": 10},
-                colorbar=dict(title="Correlation"),
-                hovertemplate="%{y} - %{x}<br>%{z:.3f}<extra></extra>"
-            ))
-            
-            fig_corr.update_layout(
-                title="Asset Correlation Matrix",
-                height=400,
-                template="plotly_white",
-                paper_bgcolor=COLOR_SCHEME['background'],
-                plot_bgcolor=COLOR_SCHEME['surface'],
-                font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
-                margin=dict(t=60, b=60, l=100, r=80)
-            )
-            
-            st.plotly_chart(fig_corr, use_container_width=True)
-
-with col_risk2:
-    # Risk-Return Scatter
-    risk_return_data = []
-    for ticker, prices in prices_data.items():
-        if prices is not None and len(prices) > 1:
-            returns = prices.pct_change().dropna()
-            annual_return = returns.mean() * 252
-            annual_volatility = returns.std() * np.sqrt(252)
-            risk_return_data.append({
-                'ticker': ticker,
-                'return': annual_return,
-                'volatility': annual_volatility
-            })
-    
-    if risk_return_data:
-        risk_df = pd.DataFrame(risk_return_data)
-        
-        fig_risk = go.Figure()
-        
-        fig_risk.add_trace(go.Scatter(
-            x=risk_df['volatility'] * 100,
-            y=risk_df['return'] * 100,
-            mode='markers+text',
-            text=risk_df['ticker'],
-            textposition="top center",
-            marker=dict(
-                size=12,
-                color=COLOR_SCHEME['primary'],
-                opacity=0.7,
-                line=dict(width=2, color='white')
-            ),
-            hovertemplate="<b>%{text}</b><br>Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
-        ))
-        
-        # Add portfolio point
-        fig_risk.add_trace(go.Scatter(
-            x=[strategy_data['volatility'] * 100],
-            y=[strategy_data['expected_return'] * 100],
-            mode='markers+text',
-            text=['Portfolio'],
-            textposition="top center",
-            marker=dict(
-                size=15,
-                color=COLOR_SCHEME['success'],
-                symbol='star',
-                line=dict(width=2, color='white')
-            ),
-            name='Portfolio',
-            hovertemplate="<b>Portfolio</b><br>Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
-        ))
-        
-        fig_risk.update_layout(
-            title="Risk-Return Profile",
-            xaxis_title="Volatility (Standard Deviation %)",
-            yaxis_title="Expected Annual Return (%)",
-            height=400,
-            template="plotly_white",
-            paper_bgcolor=COLOR_SCHEME['background'],
-            plot_bgcolor=COLOR_SCHEME['surface'],
-            font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
-            hovermode="closest",
-            margin=dict(t=60, b=60, l=80, r=60)
-        )
-        
-        st.plotly_chart(fig_risk, use_container_width=True)
-
+render_risk_analysis_section(strategy)
 st.markdown("")
-
-# Strategy Comparison
-st.markdown("### 🔗 Strategy Comparison")
-
-comparison_data = []
-for strat_name, strat_config in PORTFOLIO_STRATEGIES.items():
-    sharpe = strat_config['expected_return'] / strat_config['volatility']
-    comparison_data.append({
-        'Strategy': strat_name,
-        'Expected Return': f"{strat_config['expected_return']*100:.1f}%",
-        'Volatility': f"{strat_config['volatility']*100:.1f}%",
-        'Sharpe Ratio': f"{sharpe:.2f}",
-        'Assets': len(strat_config['allocation'])
-    })
-
-comparison_df = pd.DataFrame(comparison_data)
-st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+render_comparison_section()
 
 st.markdown("")
 
@@ -0,0 +1,94 @@
+"""Measure login latency for candidate password hashing costs.
+
+Each candidate is timed by verifying passwords through the same bounded
+thread pool the app uses, with ``--concurrency`` logins in flight at once, and
+is compared against a latency budget. Run from the project root:
+
+    python -m benchmarks.password_hashing --budget-ms 100 --concurrency 8
+
+The chosen scrypt costs are set with RISKOVIAN_SCRYPT_N / _R / _P, and the
+pool size with RISKOVIAN_PASSWORD_HASH_WORKERS.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from riskovian import passwords
+
+CANDIDATES = [
+    ('scrypt', dict(n=2**12, r=8, p=1)),
+    ('scrypt', dict(n=2**13, r=8, p=1)),
+    ('scrypt', dict(n=2**14, r=8, p=1)),
+    ('scrypt', dict(n=2**15, r=8, p=1)),
+    ('scrypt', dict(n=2**16, r=8, p=1)),
+    ('pbkdf2_sha256', dict(iterations=100000)),
+    ('pbkdf2_sha256', dict(iterations=300000)),
+    ('pbkdf2_sha256', dict(iterations=600000)),
+]
+
+
+def measure_logins(stored_hash, logins, concurrency, workers):
+    """Return per-login latencies in seconds, as seen by concurrent callers.
+
+    ``concurrency`` caller threads each submit verifications to a hashing
+    pool of ``workers`` threads and wait for the result, so latencies include
+    time spent queued behind other logins.
+    """
+    hashing_pool = ThreadPoolExecutor(max_workers=workers)
+
+    def login(_):
+        start = time.perf_counter()
+        hashing_pool.submit(passwords.verify_password, 'Benchmark1', stored_hash).result()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        latencies = list(callers.map(login, range(logins)))
+    hashing_pool.shutdown()
+    return np.array(latencies)
+
+def describe(algorithm, params):
+    """Return a short label for a candidate."""
+    if algorithm == 'scrypt':
+        return f"scrypt N=2^{params['n'].bit_length() - 1} r={params['r']} p={params['p']}"
+    return f"pbkdf2_sha256 {params['iterations']:,} iterations"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help="p95 login latency budget in milliseconds (default 100)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="logins in flight at once (default 8)")
+    parser.add_argument('--logins', type=int, default=64,
+                        help="logins timed per candidate (default 64)")
+    parser.add_argument('--workers', type=int, default=passwords.PASSWORD_HASH_WORKERS,
+                        help="hashing pool threads (default PASSWORD_HASH_WORKERS)")
+    args = parser.parse_args()
+
+    print(f"{args.logins} logins per candidate, {args.concurrency} concurrent, "
+          f"{args.workers} hashing threads, budget {args.budget_ms:.0f} ms (p95)\n")
+    print(f"{'candidate':<34}{'single ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'logins/s':>10}  budget")
+    best = {}
+    for algorithm, params in CANDIDATES:
+        stored_hash = passwords.hash_password('Benchmark1', algorithm=algorithm, **params)
+        single = measure_logins(stored_hash, 3, 1, 1).min()
+        start = time.perf_counter()
+        latencies = measure_logins(stored_hash, args.logins, args.concurrency, args.workers)
+        throughput = args.logins / (time.perf_counter() - start)
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+        within = p95 <= args.budget_ms
+        if within:
+            best[algorithm] = params
+        print(f"{describe(algorithm, params):<34}{single * 1000:>10.1f}{p50:>10.1f}{p95:>10.1f}"
+              f"{throughput:>10.1f}  {'ok' if within else 'over'}")
+
+    print()
+    if not best:
+        print("No candidate meets the budget; add hashing threads or relax the budget.")
+    for algorithm, params in best.items():
+        print(f"Most expensive {algorithm} within budget: {describe(algorithm, params)}")
+
+if __name__ == '__main__':
+    main()
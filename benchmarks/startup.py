@@ -0,0 +1,81 @@
+"""Measure cold-start time to first paint of the login page.
+
+Each sample runs the app once in a fresh interpreter, as an unauthenticated
+session, through Streamlit's AppTest harness. Streamlit itself is imported
+before the clock starts, as it is already loaded in a running server, so the
+timing covers the app's own imports and the login page render. Run from the
+project root, optionally against an earlier revision for a before/after
+comparison:
+
+    python -m benchmarks.startup --baseline HEAD~1
+"""
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+import numpy as np
+
+HEAVY_MODULES = ('numpy', 'pandas', 'plotly.graph_objects', 'scipy.optimize', 'yfinance')
+
+CHILD_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'errors': [str(e.value) for e in at.exception],
+    'modules': [m for m in sys.argv[2:] if m in sys.modules],
+}))
+"""
+
+
+def time_login_page(tree):
+    """Return one cold-start sample for the app in directory ``tree``."""
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, os.path.join(tree, 'app.py'), *HEAVY_MODULES],
+        cwd=tree, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def export_revision(revision, directory):
+    """Write the files of a git revision into ``directory``."""
+    archive = subprocess.run(['git', 'archive', revision], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter='data')
+
+def report(label, tree, runs):
+    """Time ``runs`` cold starts of ``tree`` and print a summary row."""
+    samples = [time_login_page(tree) for _ in range(runs)]
+    seconds = np.array([sample['seconds'] for sample in samples]) * 1000
+    errors = samples[-1]['errors']
+    print(f"{label:<20}{np.median(seconds):>10.0f}{seconds.min():>10.0f}  "
+          f"{', '.join(samples[-1]['modules']) or '-'}"
+          f"{'  ERRORS: ' + '; '.join(errors) if errors else ''}")
+    return np.median(seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', help="git revision to compare against, e.g. HEAD~1")
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per tree (default 5)")
+    args = parser.parse_args()
+
+    print(f"{'tree':<20}{'median ms':>10}{'min ms':>10}  heavy modules imported")
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as directory:
+            export_revision(args.baseline, directory)
+            before = report(args.baseline, directory, args.runs)
+    after = report('working tree', os.getcwd(), args.runs)
+    if args.baseline:
+        print(f"\nspeedup: {before / after:.1f}x ({before - after:.0f} ms saved)")
+
+if __name__ == '__main__':
+    main()
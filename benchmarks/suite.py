@@ -0,0 +1,358 @@
+"""Benchmark the dashboard's compute hot paths and compare results between commits.
+
+Covers Monte Carlo projections at several path counts and horizons, return
+statistics and price loading over the full ASSET_DATABASE, strategy
+comparison and portfolio optimization, construction and serialization of
+every chart, and user lookups and logins at 10, 10k and 100k users. Market
+data comes from the synthetic provider, so runs need no network and every
+machine benchmarks the same inputs.
+
+Each run saves its timings to ``.benchmarks/<commit>.json`` (with a
+``-dirty`` suffix for uncommitted changes). Run from the project root:
+
+    python -m benchmarks.suite                      # run everything and save
+    python -m benchmarks.suite -k simulation        # names starting with 'simulation'
+    python -m benchmarks.suite -k '*sqlite*'        # names matching a glob
+    python -m benchmarks.suite --compare HEAD~1     # flag regressions against a saved run
+
+Comparisons use each benchmark's fastest run, which is the least sensitive
+to background noise; only compare results saved on the same machine.
+"""
+
+import argparse
+import fnmatch
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache, partial
+
+import numpy as np
+
+from riskovian import analytics, charts, market_data, passwords, projections, simulation, strategies
+from riskovian import users as user_store
+
+RESULTS_DIR = ".benchmarks"
+# Each benchmark takes at least MIN_RUNS samples after one warm-up call, then
+# keeps sampling until MIN_SECONDS have passed or MAX_RUNS are taken. Calls
+# faster than MIN_SAMPLE_SECONDS are looped within a sample to beat timer noise.
+MIN_RUNS = 3
+MAX_RUNS = 25
+MIN_SECONDS = 1.0
+MIN_SAMPLE_SECONDS = 0.01
+# Relative slowdown of the fastest run reported as a regression.
+REGRESSION_THRESHOLD = 0.15
+
+SIMULATION_PATHS = (1_000, 10_000, 100_000)
+SIMULATION_YEARS = (10, 30)
+HISTORY_YEARS = (5, 20)
+USER_COUNTS = (10, 10_000, 100_000)
+# The dashboard's frontier settings (RANDOM_PORTFOLIO_COUNT and _BINS in app.py).
+RANDOM_PORTFOLIO_COUNT = 100000
+RANDOM_PORTFOLIO_BINS = 80
+# Logins hash with the cheapest scrypt costs so the store lookup dominates;
+# the configured hashing cost is measured on its own.
+LOGIN_PASSWORD = 'Benchmark1'
+LOGIN_HASH_COSTS = dict(n=16, r=1, p=1)
+BENCHMARK_STRATEGY = 'Moderate'
+
+
+@lru_cache(maxsize=None)
+def synthetic_prices(years=5, tickers=None):
+    """Return synthetic prices for ``tickers`` (default: the full ASSET_DATABASE)."""
+    start_date, end_date = market_data.get_date_range(years)
+    tickers = tickers or tuple(sorted(set(strategies.ASSET_DATABASE.values())))
+    return market_data.generate_synthetic_prices(tickers, start_date, end_date)
+
+@lru_cache(maxsize=None)
+def market_inputs(years=5):
+    """Return (return statistics, strategy analytics) over the full ASSET_DATABASE."""
+    return_stats = analytics.compute_return_statistics(synthetic_prices(years))
+    return return_stats, analytics.compute_strategy_analytics(return_stats, strategies.PORTFOLIO_STRATEGIES)
+
+def projection_call(model, num_simulations, years):
+    """Return a call projecting the benchmark strategy with ``project_portfolio``."""
+    return_stats, strategy_analytics = market_inputs()
+    strategy_data = strategies.get_strategy_data(BENCHMARK_STRATEGY, strategy_analytics)
+    tickers = sorted(strategy_data['allocation'])
+    return partial(
+        projections.project_portfolio, model, strategy_data['allocation'],
+        strategy_data['expected_return'], strategy_data['volatility'], 500000, years, 10000,
+        annual_returns=return_stats['annual_return'][tickers],
+        covariance=return_stats['covariance'].loc[tickers, tickers],
+        monthly_returns=return_stats['monthly_returns'][tickers],
+        num_simulations=num_simulations, seed=42
+    )
+
+def strategy_comparison_call(num_simulations, years):
+    """Return a call to ``run_strategy_comparison`` as the dashboard makes it."""
+    _, strategy_analytics = market_inputs()
+    assumptions = [strategies.get_strategy_assumptions(name, strategy_analytics)
+                   for name in strategies.PORTFOLIO_STRATEGIES]
+    return partial(
+        projections.run_strategy_comparison, 500000, years, 10000,
+        tuple(float(ret) for ret, _ in assumptions), tuple(float(vol) for _, vol in assumptions),
+        num_simulations=num_simulations, seed=42
+    )
+
+# Each setup function takes a scratch directory and returns the call to time.
+
+def setup_simulation(workdir, model, num_simulations, years):
+    return projection_call(model, num_simulations, years)
+
+def setup_strategy_comparison(workdir, num_simulations, years):
+    return strategy_comparison_call(num_simulations, years)
+
+def setup_return_statistics(workdir, years):
+    return partial(analytics.compute_return_statistics, synthetic_prices(years))
+
+def setup_strategy_analytics(workdir):
+    return partial(analytics.compute_strategy_analytics, market_inputs()[0], strategies.PORTFOLIO_STRATEGIES)
+
+def setup_efficient_frontier(workdir):
+    return_stats = market_inputs()[0]
+    return partial(analytics.compute_efficient_frontier, return_stats['annual_return'].to_numpy(),
+                   return_stats['covariance'].to_numpy())
+
+def setup_random_portfolios(workdir):
+    return_stats = market_inputs()[0]
+    return partial(analytics.generate_random_portfolios, return_stats['annual_return'].to_numpy(),
+                   return_stats['covariance'].to_numpy(), num_portfolios=RANDOM_PORTFOLIO_COUNT,
+                   bins=RANDOM_PORTFOLIO_BINS)
+
+def setup_price_matrix(workdir):
+    """Load the full ASSET_DATABASE from a warm on-disk price store."""
+    market_data.PRICE_STORE_DIR = os.path.join(workdir, 'price_store')
+    tickers = tuple(sorted(set(strategies.ASSET_DATABASE.values())))
+    start_date, end_date = market_data.get_date_range(5)
+    market_data.load_price_matrix(tickers, start_date, end_date, provider='synthetic')
+    return partial(market_data.load_price_matrix, tickers, start_date, end_date, provider='synthetic')
+
+def setup_figure(workdir, chart):
+    """Return a call that builds one dashboard chart and serializes it as Streamlit does."""
+    return_stats, strategy_analytics = market_inputs()
+    strategy_data = strategies.get_strategy_data(BENCHMARK_STRATEGY, strategy_analytics)
+    tickers = tuple(sorted(strategy_data['allocation']))
+    if chart == 'allocation':
+        build = partial(charts.allocation_figure, strategy_data['allocation'])
+    elif chart == 'performance':
+        build = partial(charts.performance_figure, synthetic_prices(5, tickers), tickers)
+    elif chart == 'projection':
+        build = partial(charts.projection_figure, projection_call('Parametric', 10000, 30)(), 30)
+    elif chart == 'distribution':
+        build = partial(charts.distribution_figure, projection_call('Parametric', 100000, 30)()['final_values'])
+    elif chart == 'strategy_comparison':
+        build = partial(charts.strategy_comparison_figure, strategy_comparison_call(10000, 30)(),
+                        list(strategies.PORTFOLIO_STRATEGIES), 30)
+    elif chart == 'correlation':
+        build = partial(charts.correlation_figure, return_stats['correlation'])
+    elif chart == 'risk_return':
+        build = partial(charts.risk_return_figure, return_stats, strategy_data)
+    else:
+        build = partial(charts.frontier_figure, return_stats, setup_efficient_frontier(workdir)(),
+                        setup_random_portfolios(workdir)(), RANDOM_PORTFOLIO_COUNT)
+    return lambda: build().to_json()
+
+def benchmark_users(count):
+    """Return ``count`` user records that share one cheap password hash."""
+    stored_hash = passwords.hash_password(LOGIN_PASSWORD, **LOGIN_HASH_COSTS)
+    return {f"user{i}@example.com": {'password': stored_hash, 'fullname': f"User {i}",
+                                     'created_at': "2024-01-01 00:00:00"}
+            for i in range(count)}
+
+def user_store_path(workdir, backend, count):
+    """Create (once per run) a user store of ``count`` users and return its path."""
+    path = os.path.join(workdir, f"users-{count}.{'db' if backend == 'sqlite' else 'json'}")
+    if not os.path.exists(path):
+        if backend == 'sqlite':
+            user_store.upsert_users(path, benchmark_users(count))
+        else:
+            user_store.save_json_users(path, benchmark_users(count))
+    return path
+
+def setup_load_users(workdir, backend, count):
+    """Load every user; 'json-cold' changes the file's mtime first so it is parsed again."""
+    path = user_store_path(workdir, backend.removesuffix('-cold'), count)
+    if backend == 'sqlite':
+        return partial(user_store.load_users, path)
+    if backend == 'json':
+        return partial(user_store.load_json_users, path)
+    mtimes = itertools.count(1)
+
+    def load_changed_file():
+        mtime = next(mtimes)
+        os.utime(path, ns=(mtime, mtime))
+        return user_store.load_json_users(path)
+    return load_changed_file
+
+def setup_login(workdir, backend, count):
+    """Mirror app.login_user: look the user up and verify the password."""
+    path = user_store_path(workdir, backend, count)
+    get_user = user_store.get_user if backend == 'sqlite' else user_store.get_json_user
+    email = f"user{count // 2}@example.com"
+
+    def login():
+        user = get_user(path, email)
+        return user is not None and passwords.verify_password(LOGIN_PASSWORD, user['password'])
+    return login
+
+def setup_password_hash(workdir):
+    """Verify one password at the configured scrypt costs."""
+    return partial(passwords.verify_password, LOGIN_PASSWORD, passwords.hash_password(LOGIN_PASSWORD))
+
+BENCHMARKS = {
+    **{f"simulation[{model}-{paths}x{years}y]": partial(setup_simulation, model=model,
+                                                      num_simulations=paths, years=years)
+       for model in projections.MONTE_CARLO_MODELS
+       for paths in SIMULATION_PATHS
+       for years in SIMULATION_YEARS},
+    **{f"strategy_comparison[{paths}x{years}y]": partial(setup_strategy_comparison,
+                                                       num_simulations=paths, years=years)
+       for paths in SIMULATION_PATHS
+       for years in SIMULATION_YEARS},
+    **{f"return_statistics[{years}y]": partial(setup_return_statistics, years=years)
+       for years in HISTORY_YEARS},
+    'strategy_analytics': setup_strategy_analytics,
+    'efficient_frontier': setup_efficient_frontier,
+    'random_portfolios': setup_random_portfolios,
+    'load_price_matrix[warm store]': setup_price_matrix,
+    **{f"figure[{chart}]": partial(setup_figure, chart=chart)
+       for chart in ('allocation', 'performance', 'projection', 'distribution',
+                     'strategy_comparison', 'correlation', 'risk_return', 'frontier')},
+    **{f"load_users[{backend}-{count}]": partial(setup_load_users, backend=backend, count=count)
+       for backend in ('sqlite', 'json', 'json-cold')
+       for count in USER_COUNTS},
+    **{f"login_user[{backend}-{count}]": partial(setup_login, backend=backend, count=count)
+       for backend in ('sqlite', 'json')
+       for count in USER_COUNTS},
+    'verify_password[configured scrypt]': setup_password_hash,
+}
+
+
+def time_benchmark(run, min_runs=MIN_RUNS, max_runs=MAX_RUNS, min_seconds=MIN_SECONDS):
+    """Return per-call timings in seconds, one per sample, after one warm-up call."""
+    warmup_start = time.perf_counter()
+    run()
+    loops = max(1, int(MIN_SAMPLE_SECONDS / (time.perf_counter() - warmup_start)))
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < min_runs or (len(samples) < max_runs
+                                      and time.perf_counter() - start < min_seconds):
+        sample_start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - sample_start) / loops)
+    return np.array(samples)
+
+def format_seconds(seconds):
+    """Format a duration with a unit that keeps three significant digits visible."""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+def git_output(*args):
+    """Return the stripped output of a git command, or None outside a repository."""
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def current_revision():
+    """Return the short commit hash, suffixed with -dirty for uncommitted changes."""
+    commit = git_output('rev-parse', '--short', 'HEAD') or 'unversioned'
+    if git_output('status', '--porcelain', '--untracked-files=no'):
+        commit += '-dirty'
+    return commit
+
+def results_path(revision):
+    """Return the saved results file for a revision, a file path or a git revision."""
+    if os.path.exists(revision):
+        return revision
+    commit = git_output('rev-parse', '--short', revision) or revision
+    return os.path.join(RESULTS_DIR, f"{commit}.json")
+
+def machine_info():
+    """Return what the timings depend on besides the code."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'simulation_workers': simulation.SIMULATION_WORKERS,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='',
+                        help="only run benchmarks whose name starts with this text or matches this glob")
+    parser.add_argument('--compare', metavar='REV',
+                        help="git revision or results file to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown reported as a regression (default 0.15)")
+    parser.add_argument('--save', metavar='NAME',
+                        help="save results as .benchmarks/NAME.json instead of the commit hash")
+    parser.add_argument('--no-save', action='store_true', help="do not save results")
+    parser.add_argument('--list', action='store_true', help="list benchmark names and exit")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS
+             if name.startswith(args.pattern) or fnmatch.fnmatchcase(name, args.pattern)]
+    if args.list:
+        print('\n'.join(names))
+        return
+    baseline = {}
+    if args.compare:
+        path = results_path(args.compare)
+        if not os.path.exists(path):
+            parser.error(f"no saved results for {args.compare} ({path}); run the suite at that commit first")
+        with open(path) as f:
+            baseline = json.load(f)['benchmarks']
+
+    revision = args.save or current_revision()
+    print(f"{len(names)} benchmarks at {revision}\n")
+    print(f"{'benchmark':<46}{'min':>10}{'median':>10}{'runs':>6}"
+          + (f"{'baseline':>10}{'change':>9}" if baseline else ''))
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            samples = time_benchmark(BENCHMARKS[name](workdir))
+            results[name] = {'min': float(samples.min()), 'median': float(np.median(samples)),
+                             'mean': float(samples.mean()), 'runs': len(samples)}
+            line = (f"{name:<46}{format_seconds(samples.min()):>10}"
+                    f"{format_seconds(np.median(samples)):>10}{len(samples):>6}")
+            if name in baseline:
+                change = samples.min() / baseline[name]['min'] - 1
+                line += f"{format_seconds(baseline[name]['min']):>10}{change:>+9.1%}"
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += "  REGRESSION"
+            print(line, flush=True)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{revision}.json")
+        saved = {'benchmarks': {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+        saved['benchmarks'].update(results)
+        saved.update(revision=revision, saved_at=datetime.now().isoformat(timespec='seconds'),
+                     machine=machine_info())
+        with open(path, 'w') as f:
+            json.dump(saved, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""Riskovian portfolio analytics engine.
+
+A headless package with no Streamlit dependency; ``app.py`` only adds
+caching and rendering on top of it.
+
+- ``strategies``: asset universe and model portfolio strategies
+- ``market_data``: price providers and the on-disk price store
+- ``analytics``: return statistics, realized strategy analytics, efficient frontier
+- ``projections``: Monte Carlo projections for the supported models
+- ``simulation``: vectorized, chunked Monte Carlo engines
+- ``downsampling``: server-side downsampling of chart series
+- ``charts`` and ``theme``: Plotly figures for every dashboard chart and their colors
+- ``users`` and ``passwords``: account storage and password hashing
+"""
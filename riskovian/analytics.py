@@ -0,0 +1,190 @@
+"""Return statistics, realized strategy analytics and portfolio optimization.
+
+Every function takes explicit inputs (price matrices, return statistics,
+annualized returns and covariances) and returns plain dicts, arrays and
+DataFrames, so the same code serves the dashboard, batch jobs and benchmarks.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def compute_return_statistics(prices):
+    """Compute the shared returns matrix and its statistics in one pass.
+
+    Returns a dict with daily 'simple_returns' and 'log_returns' DataFrames,
+    'monthly_returns' over complete calendar months, annualized
+    'annual_return' and 'annual_volatility' Series, and annualized
+    'covariance' plus 'correlation' DataFrames, or None without enough data.
+    ``prices`` is an aligned price matrix (dates x tickers) or None.
+    """
+    if prices is None or len(prices) < 3:
+        return None
+    values = prices.to_numpy()
+    gross = values[1:] / values[:-1]
+    simple = gross - 1
+    demeaned = simple - simple.mean(axis=0)
+    covariance = demeaned.T @ demeaned / (len(simple) - 1) * 252
+    volatility = np.sqrt(np.diag(covariance))
+    columns = prices.columns
+    month_end_prices = prices.groupby(prices.index.to_period('M')).last()
+    # The first and last months are partial, so only complete months are kept.
+    monthly_returns = month_end_prices.pct_change().iloc[1:-1]
+    return {
+        'simple_returns': pd.DataFrame(simple, index=prices.index[1:], columns=columns),
+        'log_returns': pd.DataFrame(np.log(gross), index=prices.index[1:], columns=columns),
+        'monthly_returns': monthly_returns,
+        'annual_return': pd.Series(simple.mean(axis=0) * 252, index=columns),
+        'annual_volatility': pd.Series(volatility, index=columns),
+        'covariance': pd.DataFrame(covariance, index=columns, columns=columns),
+        'correlation': pd.DataFrame(covariance / np.outer(volatility, volatility),
+                                    index=columns, columns=columns),
+    }
+
+def compute_strategy_analytics(return_stats, strategies, risk_free_rate=0.0):
+    """Compute realized analytics for every strategy in one batched pass.
+
+    Strategy weights form a (strategies x assets) matrix that is applied to
+    the shared daily returns matrix with a single multiply, giving every
+    strategy's daily-rebalanced return series at once. ``return_stats`` is
+    the output of ``compute_return_statistics`` for the strategies' tickers.
+
+    Returns a DataFrame indexed by strategy name with annualized 'return',
+    'volatility', 'sharpe', 'max_drawdown' and 'covariance_risk'
+    (sqrt(w' Sigma w)) columns, or None without price data. Strategies
+    missing price history for any of their assets get NaN rows.
+    """
+    if return_stats is None:
+        return None
+    columns = return_stats['simple_returns'].columns
+    names = list(strategies)
+    weights = np.array([[strategies[name]['allocation'].get(t, 0.0) for t in columns]
+                        for name in names])
+    complete = np.isclose(weights.sum(axis=1),
+                          [sum(strategies[name]['allocation'].values()) for name in names])
+
+    daily_returns = return_stats['simple_returns'].to_numpy() @ weights.T
+    annual_return = daily_returns.mean(axis=0) * 252
+    volatility = daily_returns.std(axis=0, ddof=1) * np.sqrt(252)
+    covariance = return_stats['covariance'].to_numpy()
+    covariance_risk = np.sqrt(np.einsum('ij,jk,ik->i', weights, covariance, weights))
+    wealth = np.cumprod(1 + daily_returns, axis=0)
+    max_drawdown = (wealth / np.maximum.accumulate(wealth, axis=0) - 1).min(axis=0)
+
+    analytics = pd.DataFrame({
+        'return': annual_return,
+        'volatility': volatility,
+        'sharpe': (annual_return - risk_free_rate) / volatility,
+        'max_drawdown': max_drawdown,
+        'covariance_risk': covariance_risk,
+    }, index=names)
+    analytics.loc[~complete] = np.nan
+    return analytics
+
+def compute_efficient_frontier(annual_returns, covariance, num_points=40,
+                               risk_free_rate=0.0):
+    """Solve the long-only efficient frontier with SLSQP.
+
+    Finds the minimum-variance and maximum-Sharpe portfolios, then traces
+    ``num_points`` frontier portfolios between the minimum-variance return and
+    the best single-asset return, warm-starting each solve from the previous
+    point.
+
+    Returns a dict with 'min_variance' and 'max_sharpe' portfolios (weights,
+    return, volatility, sharpe) and a 'frontier' DataFrame of return and
+    volatility with the weights of each point in 'frontier_weights'.
+    """
+    from scipy.optimize import minimize
+
+    mu = np.asarray(annual_returns, dtype=float)
+    cov = np.asarray(covariance, dtype=float)
+    num_assets = len(mu)
+    bounds = [(0.0, 1.0)] * num_assets
+    budget = {'type': 'eq', 'fun': lambda w: w.sum() - 1, 'jac': lambda w: np.ones(num_assets)}
+    options = {'ftol': 1e-10, 'maxiter': 200}
+
+    def variance(w):
+        return w @ cov @ w
+
+    def variance_grad(w):
+        return 2 * cov @ w
+
+    def negative_sharpe(w):
+        return -(w @ mu - risk_free_rate) / np.sqrt(w @ cov @ w)
+
+    def negative_sharpe_grad(w):
+        volatility = np.sqrt(w @ cov @ w)
+        excess = w @ mu - risk_free_rate
+        return -(mu * volatility - excess * (cov @ w) / volatility) / volatility**2
+
+    def describe(w):
+        w = np.clip(w, 0.0, None)
+        w = w / w.sum()
+        ret = w @ mu
+        vol = np.sqrt(w @ cov @ w)
+        return {'weights': w, 'return': ret, 'volatility': vol,
+                'sharpe': (ret - risk_free_rate) / vol}
+
+    equal_weight = np.full(num_assets, 1.0 / num_assets)
+    min_variance = minimize(variance, equal_weight, jac=variance_grad, method='SLSQP',
+                            bounds=bounds, constraints=[budget], options=options)
+    max_sharpe = minimize(negative_sharpe, equal_weight, jac=negative_sharpe_grad,
+                          method='SLSQP', bounds=bounds, constraints=[budget],
+                          options=options)
+    min_variance = describe(min_variance.x)
+    max_sharpe = describe(max_sharpe.x)
+
+    frontier_weights = []
+    weights = min_variance['weights']
+    for target in np.linspace(min_variance['return'], mu.max(), num_points):
+        on_target = {'type': 'eq', 'fun': lambda w, t=target: w @ mu - t, 'jac': lambda w: mu}
+        result = minimize(variance, weights, jac=variance_grad, method='SLSQP',
+                          bounds=bounds, constraints=[budget, on_target], options=options)
+        if result.success:
+            weights = describe(result.x)['weights']
+            frontier_weights.append(weights)
+    frontier_weights = np.array(frontier_weights).reshape(-1, num_assets)
+
+    return {
+        'min_variance': min_variance,
+        'max_sharpe': max_sharpe,
+        'frontier': pd.DataFrame({
+            'return': frontier_weights @ mu,
+            'volatility': np.sqrt(np.einsum('ij,jk,ik->i', frontier_weights, cov, frontier_weights)),
+        }),
+        'frontier_weights': frontier_weights,
+    }
+
+def generate_random_portfolios(annual_returns, covariance, num_portfolios=5000,
+                               seed=42, risk_free_rate=0.0, bins=None):
+    """Sample long-only random portfolios for the frontier scatter.
+
+    Weights are drawn as one Dirichlet (portfolios x assets) matrix; returns
+    come from a single matrix multiply and volatilities from an einsum
+    against the covariance matrix. With ``bins`` set, portfolios are binned
+    on a bins x bins (volatility, return) grid and one point per occupied
+    cell is returned, carrying the cell's portfolio count and mean Sharpe.
+
+    Returns a DataFrame with 'return', 'volatility', 'sharpe' (and 'count'
+    when binned) columns.
+    """
+    mu = np.asarray(annual_returns, dtype=float)
+    cov = np.asarray(covariance, dtype=float)
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(len(mu)), size=num_portfolios)
+    returns = weights @ mu
+    volatilities = np.sqrt(np.einsum('ij,ij->i', weights @ cov, weights))
+    sharpe = (returns - risk_free_rate) / volatilities
+    if not bins:
+        return pd.DataFrame({'return': returns, 'volatility': volatilities, 'sharpe': sharpe})
+
+    counts, vol_edges, ret_edges = np.histogram2d(volatilities, returns, bins=bins)
+    sharpe_sums, _, _ = np.histogram2d(volatilities, returns, bins=[vol_edges, ret_edges],
+                                       weights=sharpe)
+    vol_idx, ret_idx = np.nonzero(counts)
+    return pd.DataFrame({
+        'return': (ret_edges[ret_idx] + ret_edges[ret_idx + 1]) / 2,
+        'volatility': (vol_edges[vol_idx] + vol_edges[vol_idx + 1]) / 2,
+        'sharpe': sharpe_sums[vol_idx, ret_idx] / counts[vol_idx, ret_idx],
+        'count': counts[vol_idx, ret_idx].astype(int),
+    })
@@ -0,0 +1,340 @@
+"""Headless HTTP API for portfolio analytics.
+
+A small asyncio HTTP/1.1 server with JSON endpoints backed by the same
+functions as the dashboard:
+
+    GET /allocation?strategy=Moderate&investment_amount=500000
+    GET /monte-carlo?strategy=Moderate&investment_amount=500000&horizon=20
+        &monthly_contribution=10000&model=Parametric&simulations=10000
+    GET /correlation?strategy=Moderate            (or ?tickers=^NSEI,GILT.NS)
+    GET /comparison?investment_amount=500000&horizon=20&monthly_contribution=10000
+
+Parameters may also be sent as a JSON object in a POST body. Start it with:
+
+    python -m riskovian.api --port 8000 --workers 4
+
+All computation runs on a bounded process pool, and each worker keeps its
+own market data, reloaded every PRICE_REFRESH_SECONDS. Requests are
+normalized before they are dispatched, and identical requests that arrive
+while one is already being computed wait for that result instead of
+starting another job.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlsplit
+
+from riskovian import analytics, market_data, projections, simulation, strategies
+
+# Worker processes; at most two jobs per worker are queued on the pool at once
+# and further distinct requests wait their turn.
+API_WORKERS = int(os.environ.get("RISKOVIAN_API_WORKERS", os.cpu_count() or 1))
+API_MAX_SIMULATIONS = 1000000
+API_MAX_BODY_BYTES = 65536
+
+_in_flight = {}
+
+
+def init_worker():
+    """Run simulations in-process inside API workers; the API pool provides the parallelism."""
+    simulation.SIMULATION_WORKERS = 1
+
+@lru_cache(maxsize=2)
+def load_market_inputs(start_date, end_date, refresh_bucket):
+    """Return (return_stats, strategy_analytics) for every strategy asset.
+
+    ``refresh_bucket`` changes every PRICE_REFRESH_SECONDS, so each worker
+    reloads the price store at most that often.
+    """
+    return projections.load_market_inputs(start_date, end_date)
+
+def current_market_inputs():
+    """Return this worker's current (return_stats, strategy_analytics)."""
+    start_date, end_date = market_data.get_date_range(projections.HISTORY_YEARS)
+    return load_market_inputs(start_date, end_date,
+                              int(time.time() // market_data.PRICE_REFRESH_SECONDS))
+
+@lru_cache(maxsize=32)
+def load_ticker_statistics(tickers, start_date, end_date, refresh_bucket):
+    """Return return statistics for an arbitrary ticker set."""
+    prices = market_data.load_price_matrix(tickers, start_date, end_date)
+    return analytics.compute_return_statistics(prices)
+
+def allocation_response(params):
+    """Return a strategy's allocation, amounts and return assumptions."""
+    _, strategy_analytics = current_market_inputs()
+    strategy_data = strategies.get_strategy_data(params['strategy'], strategy_analytics)
+    return {
+        'strategy': params['strategy'],
+        'description': strategy_data['description'],
+        'expected_return': strategy_data['expected_return'],
+        'volatility': strategy_data['volatility'],
+        'allocation': [
+            {'ticker': ticker, 'weight': weight, 'amount': params['investment_amount'] * weight}
+            for ticker, weight in strategy_data['allocation'].items()
+        ],
+    }
+
+def monte_carlo_response(params):
+    """Return year-end percentile bands and the expected final value of one projection."""
+    return_stats, strategy_analytics = current_market_inputs()
+    strategy_data = strategies.get_strategy_data(params['strategy'], strategy_analytics)
+    allocation = strategy_data['allocation']
+    model, history = projections.model_history(params['model'], allocation, return_stats)
+    result = projections.project_portfolio(
+        model, allocation, strategy_data['expected_return'], strategy_data['volatility'],
+        params['investment_amount'], params['horizon'], params['monthly_contribution'],
+        num_simulations=params['simulations'], seed=params['seed'], **history
+    )
+    return {
+        'strategy': params['strategy'],
+        'model': model,
+        'simulations': params['simulations'],
+        'years': list(range(1, params['horizon'] + 1)),
+        'percentiles': {str(p): band[11::12] for p, band in result['percentiles'].items()},
+        'expected_value': result['expected_value'],
+    }
+
+def correlation_response(params):
+    """Return the correlation matrix and annualized statistics of a ticker set.
+
+    Returns None when there is no market data for the tickers.
+    """
+    tickers = params['tickers'] or strategies.strategy_tickers(
+        {params['strategy']: strategies.PORTFOLIO_STRATEGIES[params['strategy']]}
+    )
+    start_date, end_date = market_data.get_date_range(projections.HISTORY_YEARS)
+    return_stats = load_ticker_statistics(tuple(sorted(tickers)), start_date, end_date,
+                                          int(time.time() // market_data.PRICE_REFRESH_SECONDS))
+    if return_stats is None:
+        return None
+    correlation = return_stats['correlation']
+    return {
+        'tickers': list(correlation.columns),
+        'correlation': correlation.to_numpy(),
+        'annual_return': return_stats['annual_return'].to_numpy(),
+        'annual_volatility': return_stats['annual_volatility'].to_numpy(),
+    }
+
+def comparison_response(params):
+    """Return every strategy's projection on shared draws and its realized analytics.
+
+    The simulation count is capped at COMPARISON_MAX_SIMULATIONS; the
+    response reports the count actually used.
+    """
+    _, strategy_analytics = current_market_inputs()
+    num_simulations = min(params['simulations'], projections.COMPARISON_MAX_SIMULATIONS)
+    names = list(strategies.PORTFOLIO_STRATEGIES)
+    assumptions = [strategies.get_strategy_assumptions(name, strategy_analytics) for name in names]
+    comparison = projections.run_strategy_comparison(
+        params['investment_amount'], params['horizon'], params['monthly_contribution'],
+        tuple(float(ret) for ret, _ in assumptions), tuple(float(vol) for _, vol in assumptions),
+        num_simulations=num_simulations, seed=params['seed']
+    )
+    rows = []
+    for idx, name in enumerate(names):
+        row = {
+            'strategy': name,
+            'expected_return': assumptions[idx][0],
+            'volatility': assumptions[idx][1],
+            'final_percentiles': {str(p): band[idx, -1] for p, band in comparison['percentiles'].items()},
+            'expected_value': comparison['expected_value'][idx],
+            'probability_below_invested': comparison['probability_below'][idx],
+        }
+        if strategy_analytics is not None and strategy_analytics.loc[name].notna().all():
+            row['sharpe'] = strategy_analytics.loc[name, 'sharpe']
+            row['max_drawdown'] = strategy_analytics.loc[name, 'max_drawdown']
+        rows.append(row)
+    return {'simulations': num_simulations, 'strategies': rows}
+
+ENDPOINTS = {
+    '/allocation': (allocation_response, ('strategy', 'investment_amount')),
+    '/monte-carlo': (monte_carlo_response, ('strategy', 'investment_amount', 'horizon',
+                                            'monthly_contribution', 'model', 'simulations', 'seed')),
+    '/correlation': (correlation_response, ('strategy', 'tickers')),
+    '/comparison': (comparison_response, ('investment_amount', 'horizon', 'monthly_contribution',
+                                          'simulations', 'seed')),
+}
+
+def parse_number(raw, name, default, kind=float):
+    """Convert one request parameter to a finite ``kind`` value or raise ValueError.
+
+    Booleans are rejected, and so is any non-integral value (a string such
+    as '5.5' or a JSON number such as 2.7) when ``kind`` is int.
+    """
+    value = raw.get(name, default)
+    try:
+        if isinstance(value, bool) or (kind is int and isinstance(value, float) and not value.is_integer()):
+            raise ValueError
+        value = kind(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be {'a whole number' if kind is int else 'a number'}") from None
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be finite")
+    return value
+
+def parse_params(raw, names):
+    """Validate and normalize the request parameters an endpoint uses.
+
+    Only ``names`` are kept and every value is converted to its canonical
+    type, so equivalent requests produce identical parameter dicts.
+    Raises ValueError for invalid input, including non-finite numbers and
+    tickers outside ASSET_DATABASE (which would otherwise be downloaded
+    and stored).
+    """
+    params = {}
+    if 'strategy' in names:
+        params['strategy'] = str(raw.get('strategy', 'Moderate'))
+        if params['strategy'] not in strategies.PORTFOLIO_STRATEGIES:
+            raise ValueError(f"unknown strategy {params['strategy']!r}")
+    if 'investment_amount' in names:
+        params['investment_amount'] = parse_number(raw, 'investment_amount', 500000)
+        if params['investment_amount'] < 0:
+            raise ValueError("investment_amount must not be negative")
+    if 'monthly_contribution' in names:
+        params['monthly_contribution'] = parse_number(raw, 'monthly_contribution', 10000)
+        if params['monthly_contribution'] < 0:
+            raise ValueError("monthly_contribution must not be negative")
+    if 'horizon' in names:
+        params['horizon'] = parse_number(raw, 'horizon', 20, int)
+        if not 1 <= params['horizon'] <= 50:
+            raise ValueError("horizon must be between 1 and 50 years")
+    if 'model' in names:
+        params['model'] = str(raw.get('model', 'Parametric'))
+        if params['model'] not in projections.MONTE_CARLO_MODELS:
+            raise ValueError(f"model must be one of {', '.join(projections.MONTE_CARLO_MODELS)}")
+    if 'simulations' in names:
+        params['simulations'] = parse_number(raw, 'simulations', 10000, int)
+        if not 1 <= params['simulations'] <= API_MAX_SIMULATIONS:
+            raise ValueError(f"simulations must be between 1 and {API_MAX_SIMULATIONS:,}")
+    if 'seed' in names:
+        params['seed'] = parse_number(raw, 'seed', 42, int)
+    if 'tickers' in names:
+        tickers = raw.get('tickers', '')
+        if isinstance(tickers, str):
+            tickers = [ticker.strip() for ticker in tickers.split(',') if ticker.strip()]
+        if not isinstance(tickers, list):
+            raise ValueError("tickers must be a comma-separated string or a list")
+        params['tickers'] = tuple(sorted(set(map(str, tickers))))
+        unknown = set(params['tickers']) - set(strategies.ASSET_DATABASE.values())
+        if unknown:
+            raise ValueError(f"unknown tickers: {', '.join(sorted(unknown))}")
+    return params
+
+def to_json(value):
+    """Serialize a response, converting NumPy arrays and scalars."""
+    return json.dumps(value, default=lambda obj: obj.tolist()).encode()
+
+async def run_coalesced(key, job, executor, job_slots):
+    """Run ``job`` on the pool unless an identical one is already running.
+
+    Concurrent callers with the same key await one shared future; it is
+    shielded so a disconnecting client never cancels work others wait on.
+    """
+    future = _in_flight.get(key)
+    if future is None:
+        async def submit():
+            async with job_slots:
+                return await asyncio.get_running_loop().run_in_executor(executor, *job)
+        future = asyncio.ensure_future(submit())
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(future)
+
+async def read_request(reader):
+    """Read one request and return (method, path, raw parameters)."""
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise ValueError("malformed request line")
+    method, target, _ = request_line
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    raw = dict(parse_qsl(url.query))
+    length = int(headers.get('content-length', 0))
+    if length > API_MAX_BODY_BYTES:
+        raise ValueError("request body too large")
+    if length:
+        body = json.loads(await reader.readexactly(length))
+        if not isinstance(body, dict):
+            raise ValueError("request body must be a JSON object")
+        raw.update(body)
+    return method, url.path, raw
+
+async def handle_connection(reader, writer, executor, job_slots):
+    """Serve one request on a connection and close it."""
+    try:
+        try:
+            method, path, raw = await read_request(reader)
+            if path not in ENDPOINTS:
+                status, payload = 404, {'error': f"unknown endpoint {path}"}
+            elif method not in ('GET', 'POST'):
+                status, payload = 405, {'error': "use GET or POST"}
+            else:
+                handler, names = ENDPOINTS[path]
+                params = parse_params(raw, names)
+                key = (path, json.dumps(params, sort_keys=True))
+                payload = await run_coalesced(key, (handler, params), executor, job_slots)
+                if payload is None:
+                    status, payload = 404, {'error': "market data is unavailable"}
+                else:
+                    status = 200
+        except ValueError as error:
+            status, payload = 400, {'error': str(error)}
+        except Exception as error:
+            status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+        body = to_json(payload)
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed', 500: 'Internal Server Error'}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(host='127.0.0.1', port=8000, workers=API_WORKERS):
+    """Run the API server until cancelled."""
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    job_slots = asyncio.Semaphore(2 * workers)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, executor, job_slots), host, port
+    )
+    print(f"Riskovian API on http://{host}:{port} with {workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Riskovian analytics over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=API_WORKERS,
+                        help="worker processes (default RISKOVIAN_API_WORKERS or the CPU count)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    # Re-import under the package name so pool jobs pickle as riskovian.api
+    # functions rather than __main__ ones.
+    from riskovian.api import main as package_main
+    package_main()
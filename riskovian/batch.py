@@ -0,0 +1,192 @@
+"""Batch Monte Carlo projections for many clients.
+
+Reads a CSV or Parquet file with one row per client (strategy,
+investment_amount, horizon in years, monthly_contribution and an optional
+goal) and writes each client's projected percentiles, expected value and
+probability of reaching the goal to a Parquet (or CSV) file:
+
+    python -m riskovian.batch clients.csv projections.parquet
+
+Clients with the same strategy and horizon share one set of simulated paths.
+Every model is linear in the starting amount and the contribution, so each
+path's final value is V0 * G + c * A, where G and A are the final values of
+the same path for (V0=1, c=0) and (V0=0, c=1). A group therefore costs two
+simulations however many clients it holds, and every client sees exactly the
+paths the dashboard would simulate for the same seed.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from riskovian import market_data, strategies
+from riskovian.projections import (
+    BOOTSTRAP_BLOCK_MONTHS,
+    HISTORY_YEARS,
+    MONTE_CARLO_MODELS,
+    load_market_inputs,
+    model_history,
+    portfolio_simulator,
+)
+from riskovian.simulation import simulate_final_values
+
+CLIENT_COLUMNS = ['strategy', 'investment_amount', 'horizon', 'monthly_contribution']
+# Clients are projected in blocks so a (clients x simulations) matrix of final
+# values never holds more than CLIENT_BLOCK_VALUES numbers.
+CLIENT_BLOCK_VALUES = 5_000_000
+
+
+def read_clients(path):
+    """Read client rows from a CSV or Parquet file and validate them.
+
+    Raises ValueError for missing columns, blank required values,
+    non-numeric or non-finite numbers, unknown strategies, horizons that are
+    not whole years of at least one, and negative amounts. Goals may be blank.
+    """
+    if path.endswith('.parquet'):
+        clients = pd.read_parquet(path)
+    else:
+        clients = pd.read_csv(path)
+    missing = [column for column in CLIENT_COLUMNS if column not in clients]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    blank = [column for column in CLIENT_COLUMNS if clients[column].isna().any()]
+    if blank:
+        raise ValueError(f"blank values in: {', '.join(blank)}")
+    unknown = sorted(set(clients['strategy']) - set(strategies.PORTFOLIO_STRATEGIES))
+    if unknown:
+        raise ValueError(f"unknown strategies: {', '.join(map(str, unknown))}")
+    numeric = CLIENT_COLUMNS[1:] + (['goal'] if 'goal' in clients else [])
+    try:
+        for column in numeric:
+            clients[column] = pd.to_numeric(clients[column]).astype(float)
+    except (TypeError, ValueError):
+        raise ValueError(f"non-numeric values in {column}") from None
+    infinite = [column for column in numeric if np.isinf(clients[column]).any()]
+    if infinite:
+        raise ValueError(f"non-finite values in: {', '.join(infinite)}")
+    if (clients['horizon'] < 1).any() or (clients['horizon'] % 1 != 0).any():
+        raise ValueError("horizon must be a whole number of years, at least 1")
+    negative = [column for column in ('investment_amount', 'monthly_contribution')
+                if (clients[column] < 0).any()]
+    if negative:
+        raise ValueError(f"negative values in: {', '.join(negative)}")
+    clients['horizon'] = clients['horizon'].astype(int)
+    return clients
+
+def write_results(results, path):
+    """Write projection results to Parquet, or to CSV for a ``.csv`` path."""
+    if path.endswith('.csv'):
+        results.to_csv(path, index=False)
+    else:
+        results.to_parquet(path, index=False)
+
+def project_clients(clients, model='Parametric', return_stats=None, strategy_analytics=None,
+                    num_simulations=10000, seed=42, percentiles=(5, 50, 95),
+                    rebalance_months=12, block_months=BOOTSTRAP_BLOCK_MONTHS):
+    """Project every client and return one result row per client.
+
+    ``return_stats`` covers the strategies' assets and ``strategy_analytics``
+    supplies realized returns and volatilities; without them the assumed
+    figures and the parametric model are used. Results keep the input
+    columns and add 'p<k>' percentile columns, 'expected_value',
+    'total_invested' and, when a 'goal' column is present,
+    'probability_goal' (the chance of ending at or above the goal, or NaN
+    for clients without one).
+    """
+    results = clients.reset_index(drop=True).copy()
+    bands = np.empty((len(results), len(percentiles)))
+    expected_value = np.empty(len(results))
+    probability_goal = np.full(len(results), np.nan)
+    goals = results['goal'].to_numpy(dtype=float) if 'goal' in results else None
+
+    for (strategy_name, horizon), group in results.groupby(['strategy', 'horizon']).groups.items():
+        strategy_data = strategies.get_strategy_data(strategy_name, strategy_analytics)
+        allocation = strategy_data['allocation']
+        group_model, history = model_history(model, allocation, return_stats)
+
+        growth, annuity = (
+            simulate_final_values(
+                portfolio_simulator(group_model, allocation, strategy_data['expected_return'],
+                                    strategy_data['volatility'], initial, contribution,
+                                    horizon * 12, rebalance_months=rebalance_months,
+                                    block_months=block_months, **history),
+                num_simulations, seed
+            )
+            for initial, contribution in ((1.0, 0.0), (0.0, 1.0))
+        )
+
+        rows = np.asarray(group)
+        block = max(1, CLIENT_BLOCK_VALUES // num_simulations)
+        for start in range(0, len(rows), block):
+            block_rows = rows[start:start + block]
+            amounts = results['investment_amount'].to_numpy(dtype=float)[block_rows]
+            contributions = results['monthly_contribution'].to_numpy(dtype=float)[block_rows]
+            final_values = amounts[:, None] * growth + contributions[:, None] * annuity
+            bands[block_rows] = np.percentile(final_values, percentiles, axis=1).T
+            expected_value[block_rows] = amounts * growth.mean() + contributions * annuity.mean()
+            if goals is not None:
+                has_goal = ~np.isnan(goals[block_rows])
+                probability_goal[block_rows[has_goal]] = (
+                    final_values[has_goal] >= goals[block_rows[has_goal], None]
+                ).mean(axis=1)
+
+    for column, percentile in enumerate(percentiles):
+        results[f'p{percentile}'] = bands[:, column]
+    results['expected_value'] = expected_value
+    results['total_invested'] = (results['investment_amount']
+                                 + results['monthly_contribution'] * results['horizon'] * 12)
+    if goals is not None:
+        results['probability_goal'] = probability_goal
+    return results
+
+def positive_int(raw):
+    """argparse type for a strictly positive integer."""
+    try:
+        value = int(raw)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {raw!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Project Monte Carlo outcomes for a file of clients.")
+    parser.add_argument('clients', help="CSV or Parquet file with columns " + ", ".join(CLIENT_COLUMNS)
+                        + " and an optional goal")
+    parser.add_argument('output', help="output file (.parquet, or .csv)")
+    parser.add_argument('--model', choices=MONTE_CARLO_MODELS, default='Parametric')
+    parser.add_argument('--simulations', type=positive_int, default=10000,
+                        help="paths per strategy and horizon (default 10000)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--assumptions-only', action='store_true',
+                        help="skip market data and use each strategy's assumed return and volatility")
+    args = parser.parse_args(argv)
+
+    try:
+        clients = read_clients(args.clients)
+    except (OSError, ValueError) as error:
+        parser.error(f"cannot read {args.clients}: {error}")
+
+    start = time.perf_counter()
+    return_stats, strategy_analytics = (
+        (None, None) if args.assumptions_only
+        else load_market_inputs(*market_data.get_date_range(HISTORY_YEARS))
+    )
+    if return_stats is None and not args.assumptions_only:
+        print("Market data unavailable; using assumed returns and the parametric model.", file=sys.stderr)
+    results = project_clients(clients, args.model, return_stats, strategy_analytics,
+                              num_simulations=args.simulations, seed=args.seed)
+    write_results(results, args.output)
+    elapsed = time.perf_counter() - start
+
+    groups = clients.groupby(['strategy', 'horizon']).ngroups
+    print(f"Projected {len(clients):,} clients in {groups} strategy/horizon groups "
+          f"in {elapsed:.2f} s ({len(clients) / elapsed:,.0f} clients/s) -> {os.path.abspath(args.output)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+"""Plotly figures for every dashboard chart.
+
+Each function takes the analytics it plots (allocations, price matrices,
+projection summaries, return statistics) and returns a ``go.Figure``, so the
+charts can be built, serialized and benchmarked without Streamlit. Long line
+series are downsampled on the server before they reach the figure.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from riskovian.downsampling import lttb_indices, nan_separated_lines
+from riskovian.theme import COLOR_SCHEME
+
+# Points kept per Monte Carlo sample path after LTTB downsampling.
+SAMPLE_PATH_POINTS = 60
+# The performance chart keeps one point per PERFORMANCE_PIXELS_PER_POINT
+# pixels of PERFORMANCE_CHART_WIDTH, the widest the wide layout renders it.
+PERFORMANCE_CHART_WIDTH = 1400
+PERFORMANCE_PIXELS_PER_POINT = 2
+
+STRATEGY_COLORS = [COLOR_SCHEME['primary'], COLOR_SCHEME['secondary'], COLOR_SCHEME['accent'],
+                   COLOR_SCHEME['success'], COLOR_SCHEME['warning']]
+
+
+def allocation_figure(allocation):
+    """Build the allocation pie chart for a dict of ticker -> weight."""
+    fig = go.Figure(data=[go.Pie(
+        labels=list(allocation.keys()),
+        values=list(allocation.values()),
+        hole=0,
+        textposition="inside",
+        textinfo="label+percent",
+        hovertemplate="<b>%{label}</b><br>%{value:.1%}<extra></extra>",
+        marker=dict(
+            colors=[COLOR_SCHEME['primary'], COLOR_SCHEME['secondary'],
+                    COLOR_SCHEME['success'], COLOR_SCHEME['warning']],
+            line=dict(color=COLOR_SCHEME['surface'], width=2)
+        )
+    )])
+    fig.update_layout(
+        height=400,
+        showlegend=True,
+        margin=dict(t=0, b=0, l=0, r=0),
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['background'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary'])
+    )
+    return fig
+
+def performance_figure(prices, tickers, width=PERFORMANCE_CHART_WIDTH):
+    """Build the normalized performance chart for ``tickers`` of a price matrix.
+
+    Each series is rebased to 100 and reduced by LTTB to one point per
+    PERFORMANCE_PIXELS_PER_POINT pixels of ``width``, then drawn as a WebGL
+    trace.
+    """
+    normalized = prices[list(tickers)] / prices[list(tickers)].iloc[0] * 100
+    values = normalized.to_numpy().T
+    indices = lttb_indices(np.arange(len(normalized)), values,
+                           max(width // PERFORMANCE_PIXELS_PER_POINT, 3))
+
+    fig = go.Figure()
+    for row, ticker in enumerate(tickers):
+        fig.add_trace(go.Scattergl(
+            x=normalized.index[indices[row]],
+            y=values[row, indices[row]].astype(np.float32),
+            name=ticker,
+            mode='lines',
+            line=dict(width=2.5),
+            hovertemplate="<b>%{fullData.name}</b><br>%{x|%Y-%m-%d}<br>%{y:.2f}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Normalized Asset Performance (5-Year Period)",
+        xaxis_title="Date",
+        yaxis_title="Indexed Value (Base = 100)",
+        hovermode="x unified",
+        height=450,
+        template="plotly_white",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(t=60, b=60, l=60, r=60)
+    )
+    return fig
+
+def projection_figure(simulation, investment_horizon):
+    """Build the Monte Carlo fan chart from a ``project_portfolio`` summary.
+
+    Sample paths are downsampled into one transparent WebGL trace under the
+    5th, 50th and 95th percentile bands. Compact dtypes keep Plotly's binary
+    array encoding small.
+    """
+    num_months = investment_horizon * 12
+    months = np.arange(num_months)
+    percentiles = simulation['percentiles']
+
+    fig = go.Figure()
+    sample_x, sample_y = nan_separated_lines(
+        np.arange(num_months, dtype=np.int16), simulation['sample_paths'].T, SAMPLE_PATH_POINTS
+    )
+    fig.add_trace(go.Scattergl(
+        x=sample_x,
+        y=sample_y.astype(np.float32),
+        mode='lines',
+        line=dict(color="rgba(30, 64, 175, 0.08)", width=0.5),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=percentiles[95],
+        fill=None,
+        mode='lines',
+        name='95th Percentile (Best Case)',
+        line=dict(color=COLOR_SCHEME['success'], width=2, dash='dash'),
+        hovertemplate="95th: $%{y:,.0f}<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=percentiles[50],
+        fill='tonexty',
+        mode='lines',
+        name='50th Percentile (Median)',
+        line=dict(color=COLOR_SCHEME['primary'], width=3),
+        fillcolor="rgba(30, 64, 175, 0.2)",
+        hovertemplate="Median: $%{y:,.0f}<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=percentiles[5],
+        fill='tonexty',
+        mode='lines',
+        name='5th Percentile (Worst Case)',
+        line=dict(color=COLOR_SCHEME['accent'], width=2, dash='dash'),
+        fillcolor="rgba(220, 38, 38, 0.1)",
+        hovertemplate="5th: $%{y:,.0f}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title=f"Projected Portfolio Value Over {investment_horizon} Years",
+        xaxis_title="Months",
+        yaxis_title="Portfolio Value ($)",
+        height=500,
+        template="plotly_white",
+        hovermode="x unified",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        yaxis=dict(tickformat="$,"),
+        margin=dict(t=60, b=60, l=80, r=60)
+    )
+    return fig
+
+def distribution_figure(final_values):
+    """Build the histogram of simulated final portfolio values."""
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=final_values,
+        nbinsx=50,
+        name="Simulation Results",
+        marker=dict(color=COLOR_SCHEME['primary']),
+        hovertemplate="Portfolio Value: $%{x:,.0f}<br>Frequency: %{y}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title="Distribution of Final Portfolio Values",
+        xaxis_title="Final Portfolio Value ($)",
+        yaxis_title="Frequency",
+        height=400,
+        template="plotly_white",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        xaxis=dict(tickformat="$,"),
+        margin=dict(t=60, b=60, l=80, r=60),
+        showlegend=False
+    )
+    return fig
+
+def strategy_comparison_figure(comparison, strategy_names, investment_horizon):
+    """Build the median and 5th-95th percentile bands of every strategy.
+
+    ``comparison`` is a ``run_strategy_comparison`` summary whose rows follow
+    ``strategy_names``.
+    """
+    months = np.arange(investment_horizon * 12)
+    percentiles = comparison['percentiles']
+
+    fig = go.Figure()
+    for idx, name in enumerate(strategy_names):
+        color = STRATEGY_COLORS[idx % len(STRATEGY_COLORS)]
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([months, months[::-1]]),
+            y=np.concatenate([percentiles[95][idx], percentiles[5][idx][::-1]]),
+            fill='toself',
+            fillcolor=color,
+            opacity=0.12,
+            line=dict(width=0),
+            hoverinfo='skip',
+            legendgroup=name,
+            showlegend=False
+        ))
+        fig.add_trace(go.Scatter(
+            x=months,
+            y=percentiles[50][idx],
+            mode='lines',
+            name=name,
+            legendgroup=name,
+            line=dict(color=color, width=2.5),
+            hovertemplate=f"{name} median: $%{{y:,.0f}}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=f"Median and 5th-95th Percentile Range by Strategy Over {investment_horizon} Years",
+        xaxis_title="Months",
+        yaxis_title="Portfolio Value ($)",
+        height=500,
+        template="plotly_white",
+        hovermode="x unified",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        yaxis=dict(tickformat="$,"),
+        margin=dict(t=60, b=60, l=80, r=60)
+    )
+    return fig
+
+def correlation_figure(correlation):
+    """Build the correlation heatmap for a correlation DataFrame."""
+    fig = go.Figure(data=go.Heatmap(
+        z=correlation.values,
+        x=correlation.columns,
+        y=correlation.columns,
+        colorscale='RdYlGn',
+        zmid=0,
+        zmin=-1,
+        zmax=1,
+        text=np.round(correlation.values, 2),
+        texttemplate='%{text:.2f}',
+        textfont={"size": 10},
+        colorbar=dict(title="Correlation"),
+        hovertemplate="%{y} - %{x}<br>%{z:.3f}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title="Asset Correlation Matrix",
+        height=400,
+        template="plotly_white",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        margin=dict(t=60, b=60, l=100, r=80)
+    )
+    return fig
+
+def risk_return_figure(return_stats, strategy_data):
+    """Build the risk-return scatter of the assets and the strategy portfolio."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=return_stats['annual_volatility'].to_numpy() * 100,
+        y=return_stats['annual_return'].to_numpy() * 100,
+        mode='markers+text',
+        text=list(return_stats['annual_return'].index),
+        textposition="top center",
+        marker=dict(
+            size=12,
+            color=COLOR_SCHEME['primary'],
+            opacity=0.7,
+            line=dict(width=2, color='white')
+        ),
+        hovertemplate="<b>%{text}</b><br>Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[strategy_data['volatility'] * 100],
+        y=[strategy_data['expected_return'] * 100],
+        mode='markers+text',
+        text=['Portfolio'],
+        textposition="top center",
+        marker=dict(
+            size=15,
+            color=COLOR_SCHEME['success'],
+            symbol='star',
+            line=dict(width=2, color='white')
+        ),
+        name='Portfolio',
+        hovertemplate="<b>Portfolio</b><br>Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.update_layout(
+        title="Risk-Return Profile",
+        xaxis_title="Volatility (Standard Deviation %)",
+        yaxis_title="Expected Annual Return (%)",
+        height=400,
+        template="plotly_white",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        hovermode="closest",
+        margin=dict(t=60, b=60, l=80, r=60)
+    )
+    return fig
+
+def frontier_figure(return_stats, frontier, random_portfolios, num_portfolios):
+    """Build the efficient frontier over the binned random portfolio cloud.
+
+    ``frontier`` comes from ``compute_efficient_frontier`` and
+    ``random_portfolios`` from ``generate_random_portfolios`` with bins set;
+    ``num_portfolios`` is the number of portfolios sampled, for the legend.
+    """
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=random_portfolios['volatility'] * 100,
+        y=random_portfolios['return'] * 100,
+        mode='markers',
+        name=f'{num_portfolios:,} Random Portfolios',
+        customdata=random_portfolios['count'],
+        marker=dict(
+            size=5,
+            color=random_portfolios['sharpe'],
+            colorscale='Viridis',
+            opacity=0.6,
+            colorbar=dict(title="Sharpe")
+        ),
+        hovertemplate="Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<br>Portfolios: %{customdata:,}<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=frontier['frontier']['volatility'] * 100,
+        y=frontier['frontier']['return'] * 100,
+        mode='lines',
+        name='Efficient Frontier',
+        line=dict(color=COLOR_SCHEME['primary'], width=3),
+        hovertemplate="Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=return_stats['annual_volatility'] * 100,
+        y=return_stats['annual_return'] * 100,
+        mode='markers+text',
+        name='Assets',
+        text=list(return_stats['annual_return'].index),
+        textposition="top center",
+        marker=dict(size=10, color=COLOR_SCHEME['text_secondary'], opacity=0.7),
+        hovertemplate="<b>%{text}</b><br>Volatility: %{x:.1f}%<br>Return: %{y:.1f}%<extra></extra>"
+    ))
+
+    for label, portfolio, color, symbol in [
+        ('Minimum Variance', frontier['min_variance'], COLOR_SCHEME['secondary'], 'diamond'),
+        ('Maximum Sharpe', frontier['max_sharpe'], COLOR_SCHEME['success'], 'star'),
+    ]:
+        fig.add_trace(go.Scatter(
+            x=[portfolio['volatility'] * 100],
+            y=[portfolio['return'] * 100],
+            mode='markers',
+            name=label,
+            marker=dict(size=16, color=color, symbol=symbol, line=dict(width=2, color='white')),
+            hovertemplate=f"<b>{label}</b><br>Volatility: %{{x:.1f}}%<br>Return: %{{y:.1f}}%<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Efficient Frontier (Long-Only)",
+        xaxis_title="Volatility (Standard Deviation %)",
+        yaxis_title="Expected Annual Return (%)",
+        height=450,
+        template="plotly_white",
+        paper_bgcolor=COLOR_SCHEME['background'],
+        plot_bgcolor=COLOR_SCHEME['surface'],
+        font=dict(family="Inter", color=COLOR_SCHEME['text_primary']),
+        hovermode="closest",
+        margin=dict(t=60, b=60, l=80, r=60)
+    )
+    return fig
@@ -0,0 +1,65 @@
+"""Server-side downsampling of line series before they are sent to the browser."""
+
+import numpy as np
+
+def lttb_indices(x, y, num_points):
+    """Select Largest-Triangle-Three-Buckets indices for one or more series.
+
+    ``x`` is a shared 1-D axis of length n and ``y`` has shape (series, n).
+    The first and last points are always kept; the points in between are
+    split into ``num_points - 2`` buckets and each bucket keeps the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket. Buckets are processed in a Python loop but
+    every series is handled at once.
+
+    Returns an integer array of shape (series, num_points), or of shape
+    (series, n) when the series is already short enough.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    num_series, length = y.shape
+    if num_points >= length or num_points < 3:
+        return np.tile(np.arange(length), (num_series, 1))
+
+    edges = np.linspace(1, length - 1, num_points - 1).astype(int)
+    rows = np.arange(num_series)
+    selected = np.empty((num_series, num_points), dtype=int)
+    selected[:, 0] = 0
+    selected[:, -1] = length - 1
+    previous = np.zeros(num_series, dtype=int)
+    for bucket in range(num_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_stop = length - 1, length
+        next_x = x[next_start:next_stop].mean()
+        next_y = y[:, next_start:next_stop].mean(axis=1)
+        prev_x = x[previous]
+        prev_y = y[rows, previous]
+        area = np.abs(
+            (prev_x - next_x)[:, None] * (y[:, start:stop] - prev_y[:, None])
+            - (prev_x[:, None] - x[start:stop][None, :]) * (next_y - prev_y)[:, None]
+        )
+        previous = start + area.argmax(axis=1)
+        selected[:, bucket + 1] = previous
+    return selected
+
+def nan_separated_lines(x, y, num_points):
+    """Downsample several series and join them into one NaN-separated line.
+
+    Each series is reduced by LTTB to at most ``num_points`` points and
+    followed by a NaN in ``line_y``, which Plotly draws as a break. The gap
+    positions in ``line_x`` repeat the series' last x value rather than
+    holding NaN, so ``line_x`` keeps the dtype of ``x`` and can be sent as a
+    compact integer array.
+
+    Returns (line_x, line_y) ready for a single Plotly trace.
+    """
+    x = np.asarray(x)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    indices = lttb_indices(x, y, num_points)
+    rows = np.arange(y.shape[0])[:, None]
+    line_x = np.hstack([x[indices], x[indices[:, -1:]]]).ravel()
+    line_y = np.hstack([y[rows, indices], np.full((y.shape[0], 1), np.nan)]).ravel()
+    return line_x, line_y
@@ -0,0 +1,244 @@
+"""Market data: price providers and the on-disk price store.
+
+Adjusted closes come from a pluggable provider (live Yahoo Finance, seeded
+synthetic prices or fixture files) and are kept in a Parquet file per ticker
+under PRICE_STORE_DIR, so refreshes only download the bars that are missing.
+Nothing here depends on Streamlit; callers add their own caching.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+PRICE_STORE_DIR = "price_store"
+PRICE_REFRESH_SECONDS = 3600
+
+# Market data source: 'yfinance' (live), 'synthetic' (seeded GBM) or 'file'
+# (fixture files in PRICE_FIXTURES_DIR). Offline providers need no network.
+PRICE_PROVIDER = os.environ.get("RISKOVIAN_PRICE_PROVIDER", "yfinance")
+PRICE_FIXTURES_DIR = os.environ.get("RISKOVIAN_PRICE_FIXTURES", "price_fixtures")
+SYNTHETIC_PRICE_EPOCH = "2000-01-03"
+
+
+def get_date_range(years=5):
+    """Return the (start, end) dates covering the last ``years`` years."""
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=365*years)
+    return start_date, end_date
+
+def ticker_filename(ticker):
+    """Return a filesystem-safe file stem for a ticker symbol."""
+    return re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+
+def download_prices_yfinance(tickers, start_date, end_date):
+    """Download adjusted closes from Yahoo Finance in a single request."""
+    import yfinance as yf
+
+    data = yf.download(list(tickers), start=start_date, end=end_date,
+                       auto_adjust=False, progress=False)
+    if data is None or data.empty:
+        return None
+    closes = data['Adj Close']
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+    return closes
+
+def generate_synthetic_prices(tickers, start_date, end_date):
+    """Generate deterministic geometric Brownian motion prices for any ticker.
+
+    Each ticker gets its own drift, volatility and market beta derived from a
+    hash of its symbol, and all tickers share one seeded market factor so the
+    series are realistically correlated. Paths always start at
+    SYNTHETIC_PRICE_EPOCH, so any date range of a ticker is the same slice of
+    the same series.
+    """
+    dates = pd.bdate_range(SYNTHETIC_PRICE_EPOCH, end_date, inclusive='left')
+    market = np.random.default_rng(0).standard_normal(len(dates))
+    closes = {}
+    for ticker in tickers:
+        seed = int(hashlib.sha256(ticker.encode()).hexdigest()[:8], 16)
+        rng = np.random.default_rng(seed)
+        annual_drift = rng.uniform(0.04, 0.14)
+        annual_volatility = rng.uniform(0.04, 0.25)
+        beta = rng.uniform(0.2, 0.8)
+        shocks = beta * market + np.sqrt(1 - beta**2) * rng.standard_normal(len(dates))
+        daily_volatility = annual_volatility / np.sqrt(252)
+        log_returns = (annual_drift - 0.5 * annual_volatility**2) / 252 + daily_volatility * shocks
+        closes[ticker] = 100 * np.exp(np.cumsum(log_returns))
+    prices = pd.DataFrame(closes, index=dates)
+    return prices.loc[pd.Timestamp(start_date):]
+
+def load_fixture_prices(tickers, start_date, end_date):
+    """Load adjusted closes from fixture files in PRICE_FIXTURES_DIR.
+
+    Fixtures use the price store layout: one ``<ticker>.parquet`` (or
+    ``.csv``) file per ticker with a date index and an 'Adj Close' column.
+    """
+    closes = {}
+    for ticker in tickers:
+        base = os.path.join(PRICE_FIXTURES_DIR, ticker_filename(ticker))
+        if os.path.exists(base + '.parquet'):
+            closes[ticker] = pd.read_parquet(base + '.parquet')['Adj Close']
+        elif os.path.exists(base + '.csv'):
+            closes[ticker] = pd.read_csv(base + '.csv', index_col=0, parse_dates=True)['Adj Close']
+    if not closes:
+        return None
+    prices = pd.DataFrame(closes)
+    return prices.loc[pd.Timestamp(start_date):pd.Timestamp(end_date) - timedelta(days=1)]
+
+PRICE_PROVIDERS = {
+    'yfinance': download_prices_yfinance,
+    'synthetic': generate_synthetic_prices,
+    'file': load_fixture_prices,
+}
+
+if PRICE_PROVIDER not in PRICE_PROVIDERS:
+    raise ValueError(f"unknown RISKOVIAN_PRICE_PROVIDER {PRICE_PROVIDER!r}; "
+                     f"expected one of {', '.join(PRICE_PROVIDERS)}")
+
+def download_prices(tickers, start_date, end_date, provider=PRICE_PROVIDER):
+    """Download adjusted closes for several tickers from a price provider.
+
+    Returns a wide DataFrame (dates x tickers) that may contain gaps, or None
+    if the provider fails (e.g. the network is down). Raises ValueError for an
+    unknown provider.
+    """
+    if provider not in PRICE_PROVIDERS:
+        raise ValueError(f"unknown price provider {provider!r}; expected one of {', '.join(PRICE_PROVIDERS)}")
+    try:
+        closes = PRICE_PROVIDERS[provider](tickers, start_date, end_date)
+    except Exception:
+        return None
+    if closes is None or closes.empty:
+        return None
+    return closes.dropna(axis=1, how='all').sort_index()
+
+def price_store_path(ticker, provider=PRICE_PROVIDER):
+    """Return the on-disk Parquet file holding a ticker's price history."""
+    return os.path.join(PRICE_STORE_DIR, provider, ticker_filename(ticker) + '.parquet')
+
+def read_stored_prices(ticker, provider=PRICE_PROVIDER):
+    """Read a ticker's stored adjusted closes, or None if nothing is stored.
+
+    The Series' ``attrs['fetched_from']`` holds the start date of the last
+    full download, if one was recorded.
+    """
+    path = price_store_path(ticker, provider)
+    if not os.path.exists(path):
+        return None
+    try:
+        stored = pd.read_parquet(path)
+        prices = stored['Adj Close']
+        prices.attrs = dict(stored.attrs)
+        return prices
+    except Exception:
+        return None
+
+def write_stored_prices(ticker, prices, provider=PRICE_PROVIDER, fetched_from=None):
+    """Atomically replace a ticker's stored adjusted closes.
+
+    ``fetched_from`` is the start date of the full download the history
+    comes from; it is kept in the Parquet metadata so a ticker whose history
+    begins after that date is not downloaded in full again. Each writer uses
+    its own temporary file, so concurrent refreshes of a ticker never clash.
+    Returns False, leaving the stored file as it was, if the write fails.
+    """
+    path = price_store_path(ticker, provider)
+    frame = prices.rename('Adj Close').to_frame()
+    frame.attrs = {} if fetched_from is None else {'fetched_from': pd.Timestamp(fetched_from).isoformat()}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            frame.to_parquet(f)
+        os.replace(tmp_path, path)
+    except BaseException as error:
+        os.unlink(tmp_path)
+        if isinstance(error, OSError):
+            return False
+        raise
+    return True
+
+def stored_fetch_start(stored):
+    """Return the earliest date a stored history is known to cover.
+
+    That is the recorded start of its last full download, or its first bar
+    for files written before the start was recorded.
+    """
+    return pd.Timestamp(stored.attrs.get('fetched_from', stored.index[0]))
+
+def refresh_price_store(tickers, start_date, end_date, provider=PRICE_PROVIDER):
+    """Bring the on-disk history of each ticker up to date.
+
+    Tickers with no usable history, or whose last full download started
+    after ``start_date``, are downloaded in full; the rest only fetch the
+    bars after their last stored date. A ticker listed after the window
+    start therefore keeps refreshing incrementally. Each file is checked
+    against the network at most once per PRICE_REFRESH_SECONDS, and tickers
+    that share a fetch start date are downloaded together. A failed write
+    keeps the previously stored history.
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    pending = {}
+    for ticker in tickers:
+        stored = read_stored_prices(ticker, provider)
+        if stored is None or stored.empty:
+            pending.setdefault(start, []).append((ticker, None))
+            continue
+        age = datetime.now().timestamp() - os.path.getmtime(price_store_path(ticker, provider))
+        if age < PRICE_REFRESH_SECONDS:
+            continue
+        if stored_fetch_start(stored) > start + timedelta(days=7):
+            pending.setdefault(start, []).append((ticker, None))
+        elif stored.index[-1] < end - timedelta(days=1):
+            fetch_from = stored.index[-1] + timedelta(days=1)
+            pending.setdefault(fetch_from, []).append((ticker, stored))
+        else:
+            os.utime(price_store_path(ticker, provider))
+
+    for fetch_from, entries in pending.items():
+        new_prices = download_prices(tuple(ticker for ticker, _ in entries),
+                                     fetch_from.date(), end_date, provider)
+        for ticker, stored in entries:
+            fresh = None
+            if new_prices is not None and ticker in new_prices:
+                fresh = new_prices[ticker].dropna()
+            if stored is None:
+                if fresh is not None and not fresh.empty:
+                    write_stored_prices(ticker, fresh, provider, fetched_from=fetch_from)
+                continue
+            if fresh is not None and not fresh.empty:
+                combined = pd.concat([stored, fresh[fresh.index > stored.index[-1]]])
+                write_stored_prices(ticker, combined, provider, fetched_from=stored_fetch_start(stored))
+            else:
+                os.utime(price_store_path(ticker, provider))
+
+def load_price_matrix(tickers, start_date, end_date, provider=PRICE_PROVIDER):
+    """Load adjusted closes for a set of tickers from the local price store.
+
+    The store is refreshed first, so only missing bars hit the network.
+    Returns a wide DataFrame (dates x tickers) aligned on the dates every
+    ticker has traded, or None if no data is available. Tickers without
+    data are dropped from the columns.
+    """
+    refresh_price_store(tickers, start_date, end_date, provider)
+    series = {}
+    for ticker in tickers:
+        stored = read_stored_prices(ticker, provider)
+        if stored is not None:
+            series[ticker] = stored.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+    if not series:
+        return None
+    closes = pd.DataFrame(series).sort_index().ffill().dropna()
+    if closes.empty:
+        return None
+    return closes
@@ -0,0 +1,86 @@
+"""Salted, tunable password hashing.
+
+Passwords are hashed with scrypt from hashlib, using a fresh random salt per
+user. Each stored hash records its own algorithm and cost parameters as
+``scrypt$n$r$p$salt$hash`` or ``pbkdf2_sha256$iterations$salt$hash``, so the
+costs can be raised later without invalidating existing accounts. Bare
+64-character hex digests are legacy unsalted SHA-256 hashes; they still
+verify, and ``needs_rehash`` reports them so callers can upgrade them after a
+successful login.
+
+Hashing is deliberately slow, so it runs on a small process-wide thread pool:
+hashlib releases the GIL while deriving keys, and the pool bounds how many
+derivations (and how much scrypt memory) run at once under concurrent logins.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# scrypt cost parameters for new hashes; N=2**14, r=8 uses 16 MiB per hash.
+# Use ``python -m benchmarks.password_hashing`` to pick values for a latency budget.
+SCRYPT_N = int(os.environ.get("RISKOVIAN_SCRYPT_N", 2**14))
+SCRYPT_R = int(os.environ.get("RISKOVIAN_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("RISKOVIAN_SCRYPT_P", 1))
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# Threads that derive keys; each concurrent scrypt call holds 128 * N * r bytes.
+PASSWORD_HASH_WORKERS = int(os.environ.get("RISKOVIAN_PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+
+
+def encode(data):
+    """Return unpadded URL-safe base64 text for ``data``."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+def decode(text):
+    """Invert ``encode``."""
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def scrypt_key(password, salt, n, r, p):
+    """Derive a scrypt key, allowing enough memory for the given costs."""
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r * p, dklen=KEY_BYTES)
+
+def hash_password(password, algorithm='scrypt', n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                  iterations=PBKDF2_ITERATIONS):
+    """Hash a password with a new random salt and return the encoded record."""
+    salt = os.urandom(SALT_BYTES)
+    if algorithm == 'pbkdf2_sha256':
+        key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations, dklen=KEY_BYTES)
+        return f"pbkdf2_sha256${iterations}${encode(salt)}${encode(key)}"
+    key = scrypt_key(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${encode(salt)}${encode(key)}"
+
+def is_legacy_hash(stored_hash):
+    """Return True for an unsalted SHA-256 hex digest from the original scheme."""
+    return len(stored_hash) == 64 and '$' not in stored_hash
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored hash in any supported format."""
+    if is_legacy_hash(stored_hash):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored_hash)
+    algorithm, *fields = stored_hash.split('$')
+    if algorithm == 'scrypt':
+        n, r, p, salt, key = fields
+        derived = scrypt_key(password, decode(salt), int(n), int(r), int(p))
+    elif algorithm == 'pbkdf2_sha256':
+        iterations, salt, key = fields
+        derived = hashlib.pbkdf2_hmac('sha256', password.encode(), decode(salt), int(iterations),
+                                      dklen=KEY_BYTES)
+    else:
+        return False
+    return hmac.compare_digest(derived, decode(key))
+
+def needs_rehash(stored_hash):
+    """Return True if a stored hash is not scrypt with the current cost parameters."""
+    return not stored_hash.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+@lru_cache(maxsize=None)
+def get_hashing_pool(workers=PASSWORD_HASH_WORKERS):
+    """Return the process-wide thread pool that runs key derivations."""
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
@@ -0,0 +1,142 @@
+"""Monte Carlo projections of portfolio value.
+
+These wrap the engines in ``riskovian.simulation`` with the app's inputs
+(amount, horizon in years, monthly contribution, strategy assumptions or
+return statistics) and return the chunked summary dicts of
+``run_chunked_simulation``. ``load_market_inputs`` and ``model_history``
+prepare those inputs the same way for the batch job and the HTTP API.
+"""
+
+from functools import partial
+
+import numpy as np
+
+from riskovian import analytics, market_data, strategies
+from riskovian.simulation import (
+    SIMULATION_CHUNK_SIZE,
+    run_chunked_simulation,
+    simulate_bootstrap_paths,
+    simulate_correlated_paths,
+    simulate_portfolio_paths,
+    simulate_strategy_paths,
+)
+
+MONTE_CARLO_MODELS = ['Parametric', 'Correlated Assets', 'Historical Bootstrap']
+BOOTSTRAP_BLOCK_MONTHS = 12
+REBALANCE_FREQUENCIES = {'Monthly': 1, 'Quarterly': 3, 'Annually': 12}
+# The strategy comparison simulates every strategy per path, so it is capped
+# separately from single-portfolio projections.
+COMPARISON_MAX_SIMULATIONS = 100000
+# Years of price history behind the realized returns and the historical models.
+HISTORY_YEARS = 5
+
+
+def run_strategy_comparison(investment_amount, investment_horizon, monthly_contribution,
+                            annual_returns, annual_volatilities, num_simulations=1000,
+                            seed=42, percentiles=(5, 50, 95)):
+    """Run a batched Monte Carlo projection for several strategies.
+
+    Every summary array gains a leading strategy axis: percentile bands
+    have shape (strategies, months). Chunks hold fewer paths so a chunk of
+    all strategies stays the size of a single-strategy chunk. The summary
+    also reports each strategy's probability of ending below the total
+    amount invested.
+    """
+    num_months = investment_horizon * 12
+    simulate_chunk = partial(
+        simulate_strategy_paths, investment_amount, monthly_contribution,
+        num_months, annual_returns, annual_volatilities
+    )
+    return run_chunked_simulation(
+        simulate_chunk, num_simulations, seed, percentiles, num_sample_paths=0,
+        chunk_size=max(1, SIMULATION_CHUNK_SIZE // len(annual_returns)),
+        final_threshold=investment_amount + monthly_contribution * num_months
+    )
+
+def portfolio_simulator(model, allocation, expected_return, volatility,
+                        investment_amount, monthly_contribution, num_months,
+                        annual_returns=None, covariance=None, monthly_returns=None,
+                        rebalance_months=12, block_months=BOOTSTRAP_BLOCK_MONTHS):
+    """Return the chunk simulator ``project_portfolio`` runs for ``model``.
+
+    The result is a picklable ``simulate_chunk(num_simulations, seed)`` for
+    ``run_chunked_simulation``; inputs are as for ``project_portfolio``.
+    """
+    if model == 'Correlated Assets':
+        tickers = list(annual_returns.index)
+        return partial(
+            simulate_correlated_paths, investment_amount, monthly_contribution, num_months,
+            np.array([allocation[t] for t in tickers]), annual_returns.to_numpy(),
+            covariance.loc[tickers, tickers].to_numpy(), rebalance_months=rebalance_months
+        )
+    if model == 'Historical Bootstrap':
+        weights = np.array([allocation[t] for t in monthly_returns.columns])
+        return partial(
+            simulate_bootstrap_paths, investment_amount, monthly_contribution, num_months,
+            monthly_returns.to_numpy() @ (weights / weights.sum()), block_months=block_months
+        )
+    return partial(
+        simulate_portfolio_paths, investment_amount, monthly_contribution, num_months,
+        expected_return, volatility
+    )
+
+def model_available(model, allocation, return_stats):
+    """Return True if ``return_stats`` has the history ``model`` needs for ``allocation``.
+
+    The parametric model needs no history; the others need statistics for
+    every asset and at least one bootstrap block of monthly returns.
+    """
+    if model == 'Parametric':
+        return True
+    return (
+        return_stats is not None
+        and set(allocation).issubset(return_stats['annual_return'].index)
+        and len(return_stats['monthly_returns']) >= BOOTSTRAP_BLOCK_MONTHS
+    )
+
+def model_history(model, allocation, return_stats):
+    """Return (model, history) for projecting ``allocation`` with ``model``.
+
+    Falls back to 'Parametric' when ``model_available`` is False. ``history``
+    holds the annual_returns, covariance and monthly_returns keyword
+    arguments of ``project_portfolio`` for the allocation's assets, and is
+    empty for the parametric model.
+    """
+    if not model_available(model, allocation, return_stats):
+        return 'Parametric', {}
+    if model == 'Parametric':
+        return model, {}
+    tickers = sorted(allocation)
+    return model, {
+        'annual_returns': return_stats['annual_return'][tickers],
+        'covariance': return_stats['covariance'].loc[tickers, tickers],
+        'monthly_returns': return_stats['monthly_returns'][tickers],
+    }
+
+def load_market_inputs(start_date, end_date):
+    """Load (return_stats, strategy_analytics) for every strategy asset.
+
+    Both are None when the price store has no data for the date range.
+    """
+    prices = market_data.load_price_matrix(strategies.strategy_tickers(), start_date, end_date)
+    return_stats = analytics.compute_return_statistics(prices)
+    return return_stats, analytics.compute_strategy_analytics(return_stats, strategies.PORTFOLIO_STRATEGIES)
+
+def project_portfolio(model, allocation, expected_return, volatility,
+                      investment_amount, investment_horizon, monthly_contribution,
+                      annual_returns=None, covariance=None, monthly_returns=None,
+                      num_simulations=1000, seed=42, rebalance_months=12,
+                      block_months=BOOTSTRAP_BLOCK_MONTHS):
+    """Project one portfolio with any of MONTE_CARLO_MODELS.
+
+    'Parametric' uses ``expected_return`` and ``volatility``; 'Correlated
+    Assets' needs the assets' ``annual_returns`` Series and annualized
+    ``covariance`` DataFrame; 'Historical Bootstrap' needs the assets'
+    ``monthly_returns`` DataFrame. Asset weights come from ``allocation``.
+    """
+    simulate_chunk = portfolio_simulator(
+        model, allocation, expected_return, volatility, investment_amount,
+        monthly_contribution, investment_horizon * 12, annual_returns, covariance,
+        monthly_returns, rebalance_months, block_months
+    )
+    return run_chunked_simulation(simulate_chunk, num_simulations, seed)
@@ -0,0 +1,348 @@
+"""Vectorized Monte Carlo engines for portfolio projections.
+
+Everything here is plain NumPy with no Streamlit dependency, so chunks can be
+shipped to worker processes and the engines can be reused outside the app.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+
+import numpy as np
+
+# Simulations run in chunks of SIMULATION_CHUNK_SIZE paths. Runs larger than one
+# chunk keep per-month quantile sketches (relative error SKETCH_RELATIVE_ACCURACY)
+# and a sample of FINAL_VALUE_SAMPLE_SIZE final values instead of every path.
+SIMULATION_CHUNK_SIZE = 10000
+SKETCH_RELATIVE_ACCURACY = 0.005
+SKETCH_BUCKETS = 2048
+FINAL_VALUE_SAMPLE_SIZE = 20000
+
+# Worker processes used for multi-chunk runs; 1 runs every chunk in-process.
+SIMULATION_WORKERS = int(os.environ.get("RISKOVIAN_SIMULATION_WORKERS", os.cpu_count() or 1))
+
+
+def compound_paths(growth, initial_amount, monthly_contribution):
+    """Compound monthly growth factors (1 + return) into portfolio value paths.
+
+    Months run along axis -2 and simulations along axis -1. The
+    contribute-then-compound recursion V_t = (V_{t-1} + c) * (1 + r_t) is
+    solved with cumulative array operations as
+    V_t = G_t * (V_0 + c * sum_{j<=t} 1 / G_{j-1}), where G_t is the cumulative
+    growth up to month t. ``growth`` is overwritten with G to avoid a copy.
+
+    Returns (paths, final_values).
+    """
+    np.cumprod(growth, axis=-2, out=growth)
+    paths = np.empty_like(growth)
+    paths[..., 0, :] = 1.0
+    np.divide(1.0, growth[..., :-1, :], out=paths[..., 1:, :])
+    np.cumsum(paths, axis=-2, out=paths)
+    paths *= monthly_contribution
+    paths += initial_amount
+    paths *= growth
+    return paths, paths[..., -1, :]
+
+def simulate_portfolio_paths(initial_amount, monthly_contribution, num_months,
+                             annual_return, annual_volatility,
+                             num_simulations=1000, seed=42):
+    """Simulate portfolio value paths with normally distributed monthly returns.
+
+    Every monthly return is drawn as a single (num_months x num_simulations)
+    array from a seeded ``np.random.Generator``.
+
+    Returns (paths, final_values) where paths has shape (num_months, num_simulations).
+    """
+    rng = np.random.default_rng(seed)
+    monthly_mean = annual_return / 252 * 21
+    monthly_volatility = annual_volatility / np.sqrt(252) * np.sqrt(21)
+    growth = rng.standard_normal((num_months, num_simulations))
+    growth *= monthly_volatility
+    growth += 1 + monthly_mean
+    return compound_paths(growth, initial_amount, monthly_contribution)
+
+def simulate_strategy_paths(initial_amount, monthly_contribution, num_months,
+                            annual_returns, annual_volatilities,
+                            num_simulations=1000, seed=42):
+    """Simulate several strategies at once on shared random draws.
+
+    One (num_months x num_simulations) block of standard normal shocks is
+    scaled by each strategy's monthly mean and volatility, so every strategy
+    sees the same market scenarios and, for a given seed, matches the draws
+    of simulate_portfolio_paths.
+
+    Returns (paths, final_values) with shapes (strategies, num_months,
+    num_simulations) and (strategies, num_simulations).
+    """
+    rng = np.random.default_rng(seed)
+    monthly_means = np.asarray(annual_returns, dtype=float) / 252 * 21
+    monthly_volatilities = np.asarray(annual_volatilities, dtype=float) / np.sqrt(252) * np.sqrt(21)
+    shocks = rng.standard_normal((num_months, num_simulations))
+    growth = shocks * monthly_volatilities[:, None, None]
+    growth += 1 + monthly_means[:, None, None]
+    return compound_paths(growth, initial_amount, monthly_contribution)
+
+def cholesky_factor(covariance):
+    """Return a lower-triangular factor L with L @ L.T equal to the covariance.
+
+    Sample covariance matrices that are not numerically positive definite
+    have their negative eigenvalues clipped before factoring.
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        repaired = (eigenvectors * np.clip(eigenvalues, 1e-12, None)) @ eigenvectors.T
+        return np.linalg.cholesky(repaired)
+
+def simulate_correlated_paths(initial_amount, monthly_contribution, num_months,
+                              weights, annual_returns, annual_covariance,
+                              num_simulations=1000, seed=42, rebalance_months=12):
+    """Simulate a multi-asset portfolio with correlated monthly asset returns.
+
+    Monthly asset returns are drawn as standard normal shocks multiplied by
+    the Cholesky factor of the monthly covariance. Holdings start at the
+    target ``weights``, contributions are invested at those weights, and the
+    portfolio is rebalanced back to them every ``rebalance_months``. Within
+    each rebalancing period every asset is compounded for all simulations at
+    once, so the only Python loop is over rebalancing periods.
+
+    Returns (paths, final_values) where paths has shape (num_months, num_simulations).
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    monthly_means = np.asarray(annual_returns, dtype=float) / 12
+    factor = cholesky_factor(np.asarray(annual_covariance, dtype=float) / 12)
+    asset_contributions = (monthly_contribution * weights)[:, None, None]
+
+    paths = np.empty((num_months, num_simulations))
+    portfolio_value = np.full(num_simulations, float(initial_amount))
+    for start in range(0, num_months, rebalance_months):
+        period = min(rebalance_months, num_months - start)
+        shocks = rng.standard_normal((len(weights), period, num_simulations))
+        growth = (factor @ shocks.reshape(len(weights), -1)).reshape(shocks.shape)
+        growth += 1 + monthly_means[:, None, None]
+        holdings, _ = compound_paths(growth, weights[:, None, None] * portfolio_value,
+                                     asset_contributions)
+        paths[start:start + period] = holdings.sum(axis=0)
+        portfolio_value = paths[start + period - 1]
+    return paths, paths[-1]
+
+def simulate_bootstrap_paths(initial_amount, monthly_contribution, num_months,
+                             historical_returns, num_simulations=1000, seed=42,
+                             block_months=12):
+    """Simulate portfolio paths by block-bootstrapping historical monthly returns.
+
+    Each path is stitched together from randomly chosen runs of
+    ``block_months`` consecutive historical months, which keeps the fat tails
+    and short-term autocorrelation of the real series. Block start indices
+    are sampled for every path at once and expanded into one
+    (num_months x num_simulations) index array.
+
+    Returns (paths, final_values) where paths has shape (num_months, num_simulations).
+    """
+    rng = np.random.default_rng(seed)
+    historical_returns = np.asarray(historical_returns, dtype=float)
+    block_months = max(1, min(block_months, len(historical_returns)))
+    num_blocks = -(-num_months // block_months)
+    starts = rng.integers(0, len(historical_returns) - block_months + 1,
+                          size=(num_blocks, 1, num_simulations))
+    offsets = np.arange(block_months)[None, :, None]
+    index = (starts + offsets).reshape(num_blocks * block_months, num_simulations)[:num_months]
+    growth = 1 + historical_returns[index]
+    return compound_paths(growth, initial_amount, monthly_contribution)
+
+def create_quantile_sketch(values):
+    """Create an empty log-bucket quantile sketch with one row per values row.
+
+    Buckets grow geometrically by gamma = (1 + a) / (1 - a) with
+    a = SKETCH_RELATIVE_ACCURACY, so every quantile is estimated to within
+    about that relative error. Each row gets SKETCH_BUCKETS buckets
+    positioned from the first batch of ``values``; anything outside that
+    very wide range is clamped into the edge buckets.
+    """
+    log_gamma = np.log1p(2 * SKETCH_RELATIVE_ACCURACY / (1 - SKETCH_RELATIVE_ACCURACY))
+    keys = np.ceil(np.log(np.maximum(values, np.finfo(float).tiny)) / log_gamma)
+    return {
+        'log_gamma': log_gamma,
+        'offset': keys.min(axis=1).astype(np.int64) - SKETCH_BUCKETS // 8,
+        'counts': np.zeros((values.shape[0], SKETCH_BUCKETS), dtype=np.int64),
+        'total': 0,
+    }
+
+def update_quantile_sketch(sketch, values):
+    """Add a (rows x samples) batch of positive values to a quantile sketch."""
+    num_rows = values.shape[0]
+    keys = np.ceil(np.log(np.maximum(values, np.finfo(float).tiny)) / sketch['log_gamma']).astype(np.int64)
+    keys -= sketch['offset'][:, None]
+    np.clip(keys, 0, SKETCH_BUCKETS - 1, out=keys)
+    keys += (np.arange(num_rows) * SKETCH_BUCKETS)[:, None]
+    sketch['counts'] += np.bincount(keys.ravel(), minlength=num_rows * SKETCH_BUCKETS).reshape(num_rows, SKETCH_BUCKETS)
+    sketch['total'] += values.shape[1]
+
+def query_quantile_sketch(sketch, percentiles):
+    """Estimate the given percentiles of every sketch row."""
+    cumulative = np.cumsum(sketch['counts'], axis=1)
+    gamma = np.exp(sketch['log_gamma'])
+    estimates = []
+    for percentile in percentiles:
+        rank = percentile / 100 * (sketch['total'] - 1)
+        keys = np.argmax(cumulative > rank, axis=1) + sketch['offset']
+        estimates.append(2 * np.exp(keys * sketch['log_gamma']) / (gamma + 1))
+    return estimates
+
+@lru_cache(maxsize=None)
+def get_process_pool(workers):
+    """Return the process-wide simulation pool with ``workers`` processes.
+
+    Workers are spawned rather than forked so they never inherit the web
+    server's threads, and the pool is reused across reruns and sessions.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def map_chunks(tasks, workers):
+    """Run zero-argument tasks and yield their results in submission order.
+
+    With more than one worker the tasks run on the shared process pool, with
+    at most two tasks per worker in flight so finished results never pile up
+    in memory. If a worker dies (e.g. killed for running out of memory) the
+    broken pool is discarded so the next run starts a fresh one, and the
+    remaining tasks of this run finish in-process.
+    """
+    tasks = list(tasks)
+    if workers <= 1:
+        for task in tasks:
+            yield task()
+        return
+    executor = get_process_pool(workers)
+    pending = deque()
+    completed = 0
+    try:
+        for task in tasks:
+            pending.append(executor.submit(task))
+            if len(pending) >= 2 * workers:
+                result = pending.popleft().result()
+                completed += 1
+                yield result
+        while pending:
+            result = pending.popleft().result()
+            completed += 1
+            yield result
+    except BrokenProcessPool:
+        get_process_pool.cache_clear()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for task in tasks[completed:]:
+            yield task()
+
+def summarize_chunk(simulate_chunk, size, seed, sketch_layout, final_threshold=None):
+    """Simulate one chunk and reduce it to partial aggregates that can be merged.
+
+    Only the sketch's non-zero buckets (as flat int32 indices and counts)
+    and per-row scalars leave the function, never the paths themselves, so
+    the result stays a fraction of the chunk's size when a worker process
+    sends it back.
+    """
+    paths, final_values = simulate_chunk(num_simulations=size, seed=seed)
+    sketch = dict(sketch_layout, counts=np.zeros((sketch_layout['offset'].size, SKETCH_BUCKETS),
+                                                 dtype=np.int64), total=0)
+    update_quantile_sketch(sketch, paths.reshape(-1, size))
+    del paths
+    counts = sketch['counts'].ravel()
+    buckets = np.flatnonzero(counts)
+    return {
+        'buckets': buckets.astype(np.int32),
+        'bucket_counts': counts[buckets].astype(np.int32),
+        'final_sum': final_values.sum(axis=-1),
+        'final_below': 0 if final_threshold is None else (final_values < final_threshold).sum(axis=-1),
+        'final_samples': final_values[..., :FINAL_VALUE_SAMPLE_SIZE].copy(),
+    }
+
+def run_chunked_simulation(simulate_chunk, num_simulations, seed=42, percentiles=(5, 50, 95),
+                           num_sample_paths=100, chunk_size=SIMULATION_CHUNK_SIZE,
+                           final_threshold=None, workers=None):
+    """Run a simulation in fixed-size chunks and aggregate it in bounded memory.
+
+    ``simulate_chunk(num_simulations=n, seed=s)`` must return (paths,
+    final_values) with simulations along the last axis and months along the
+    axis before it, and must be picklable (e.g. a ``functools.partial`` of a
+    module-level function) when ``workers`` > 1. Chunk k always uses child k
+    of ``SeedSequence(seed)`` and results are merged in chunk order, so the
+    output depends only on the seed and chunk size, never on the worker
+    count. A single chunk gets exact percentiles; larger runs merge every
+    chunk into a quantile sketch, so peak memory is bounded by the chunk
+    size and the number of chunks in flight, whatever the simulation count.
+
+    Returns a dict with per-month 'percentiles' bands, the first
+    ``num_sample_paths`` paths as 'sample_paths', up to
+    FINAL_VALUE_SAMPLE_SIZE 'final_values', the exact 'expected_value' and,
+    when ``final_threshold`` is given, the exact 'probability_below' it.
+    """
+    workers = SIMULATION_WORKERS if workers is None else workers
+    chunk_sizes = [min(chunk_size, num_simulations - start)
+                   for start in range(0, num_simulations, chunk_size)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    paths, final_values = simulate_chunk(num_simulations=chunk_sizes[0], seed=chunk_seeds[0])
+    sample_paths = paths[..., :num_sample_paths].copy()
+    final_samples = [final_values[..., :FINAL_VALUE_SAMPLE_SIZE].copy()]
+    num_final_samples = final_samples[0].shape[-1]
+    final_sum = final_values.sum(axis=-1)
+    final_below = 0 if final_threshold is None else (final_values < final_threshold).sum(axis=-1)
+
+    if len(chunk_sizes) == 1:
+        bands = list(np.percentile(paths, percentiles, axis=-1))
+    else:
+        rows = paths.reshape(-1, chunk_sizes[0])
+        sketch = create_quantile_sketch(rows)
+        update_quantile_sketch(sketch, rows)
+        del paths, final_values, rows
+        sketch_layout = {'log_gamma': sketch['log_gamma'], 'offset': sketch['offset']}
+        tasks = [partial(summarize_chunk, simulate_chunk, size, chunk_seed, sketch_layout, final_threshold)
+                 for size, chunk_seed in zip(chunk_sizes[1:], chunk_seeds[1:])]
+        for size, chunk in zip(chunk_sizes[1:], map_chunks(tasks, workers)):
+            sketch['counts'].reshape(-1)[chunk['buckets']] += chunk['bucket_counts']
+            sketch['total'] += size
+            final_sum = final_sum + chunk['final_sum']
+            final_below = final_below + chunk['final_below']
+            if num_final_samples < FINAL_VALUE_SAMPLE_SIZE:
+                kept = chunk['final_samples'][..., :FINAL_VALUE_SAMPLE_SIZE - num_final_samples]
+                final_samples.append(kept)
+                num_final_samples += kept.shape[-1]
+        bands = [band.reshape(sample_paths.shape[:-1])
+                 for band in query_quantile_sketch(sketch, percentiles)]
+
+    summary = {
+        'percentiles': dict(zip(percentiles, bands)),
+        'sample_paths': sample_paths,
+        'final_values': np.concatenate(final_samples, axis=-1),
+        'expected_value': final_sum / num_simulations,
+    }
+    if final_threshold is not None:
+        summary['probability_below'] = final_below / num_simulations
+    return summary
+
+def final_values_chunk(simulate_chunk, size, seed):
+    """Simulate one chunk and keep only its final values."""
+    return simulate_chunk(num_simulations=size, seed=seed)[1]
+
+def simulate_final_values(simulate_chunk, num_simulations, seed=42,
+                          chunk_size=SIMULATION_CHUNK_SIZE, workers=None):
+    """Return the final value of every simulated path.
+
+    Chunks are sized and seeded exactly as in ``run_chunked_simulation``, so
+    the values are those of the paths it summarizes for the same seed.
+    Only final values are kept, so memory grows with ``num_simulations``
+    rather than with the number of months.
+    """
+    workers = SIMULATION_WORKERS if workers is None else workers
+    chunk_sizes = [min(chunk_size, num_simulations - start)
+                   for start in range(0, num_simulations, chunk_size)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [partial(final_values_chunk, simulate_chunk, size, chunk_seed)
+             for size, chunk_seed in zip(chunk_sizes, chunk_seeds)]
+    return np.concatenate(list(map_chunks(tasks, workers)), axis=-1)
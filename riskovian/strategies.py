@@ -0,0 +1,78 @@
+"""Asset universe and model portfolio strategies.
+
+PORTFOLIO_STRATEGIES holds each strategy's allocation plus assumed return and
+volatility, which serve as fallbacks whenever realized analytics from price
+history are unavailable.
+"""
+
+ASSET_DATABASE = {
+    'NIFTY 50': '^NSEI',
+    'NIFTY IT': '^CNXIT',
+    'NIFTY MIDCAP 50': '^NSMID50',
+    'Government Bonds': 'GILT.NS',
+    'Gold ETF': '^NSEINDEXG',
+    'Bank NIFTY': '^NSEBANK',
+    'PSU Stocks': '^CNXINFRA',
+    'NIFTY 100': '^NSEI',
+}
+
+PORTFOLIO_STRATEGIES = {
+    'Conservative': {
+        'description': 'Low risk, stable returns. Suitable for retirees and risk-averse investors.',
+        'allocation': {'GILT.NS': 0.70, '^NSEI': 0.25, '^NSEINDEXG': 0.05},
+        'expected_return': 0.065,
+        'volatility': 0.08
+    },
+    'Moderate': {
+        'description': 'Balanced approach. Suitable for long-term investors with moderate risk tolerance.',
+        'allocation': {'^NSEI': 0.50, 'GILT.NS': 0.40, '^NSMID50': 0.05, '^NSEINDEXG': 0.05},
+        'expected_return': 0.095,
+        'volatility': 0.12
+    },
+    'Aggressive': {
+        'description': 'Growth-focused. Suitable for investors with high risk tolerance and longer time horizons.',
+        'allocation': {'^NSEI': 0.35, '^CNXIT': 0.30, '^NSMID50': 0.20, '^NSEBANK': 0.15},
+        'expected_return': 0.140,
+        'volatility': 0.18
+    },
+    'Growth': {
+        'description': 'Emphasizes capital appreciation through Indian equities.',
+        'allocation': {'^CNXIT': 0.35, '^NSEI': 0.35, '^NSMID50': 0.20, '^NSEINDEXG': 0.10},
+        'expected_return': 0.125,
+        'volatility': 0.16
+    },
+    'Income': {
+        'description': 'Focus on stable income through bonds and dividend stocks.',
+        'allocation': {'GILT.NS': 0.50, '^NSEBANK': 0.30, '^NSEI': 0.15, '^NSEINDEXG': 0.05},
+        'expected_return': 0.080,
+        'volatility': 0.09
+    }
+}
+
+
+def strategy_tickers(strategies=PORTFOLIO_STRATEGIES):
+    """Return the sorted tickers held by any of ``strategies``."""
+    return tuple(sorted({t for config in strategies.values() for t in config['allocation']}))
+
+def get_strategy_assumptions(strategy_name, analytics=None):
+    """Return a strategy's (expected_return, volatility).
+
+    Realized analytics are preferred; the assumptions hardcoded in
+    PORTFOLIO_STRATEGIES are the fallback when price data is unavailable.
+    """
+    if analytics is not None and analytics.loc[strategy_name].notna().all():
+        return analytics.loc[strategy_name, 'return'], analytics.loc[strategy_name, 'volatility']
+    config = PORTFOLIO_STRATEGIES[strategy_name]
+    return config['expected_return'], config['volatility']
+
+def get_strategy_data(strategy_name, analytics=None):
+    """Return a strategy's configuration with realized return and volatility.
+
+    The assumed figures in PORTFOLIO_STRATEGIES are kept when ``analytics``
+    (from ``compute_strategy_analytics``) has no row for the strategy.
+    """
+    strategy_data = dict(PORTFOLIO_STRATEGIES[strategy_name])
+    strategy_data['expected_return'], strategy_data['volatility'] = get_strategy_assumptions(
+        strategy_name, analytics
+    )
+    return strategy_data
@@ -0,0 +1,20 @@
+"""Colors shared by the dashboard styles and its charts.
+
+Kept apart from ``charts`` so the login page can be styled without importing
+Plotly.
+"""
+
+COLOR_SCHEME = {
+    'primary': '#1E40AF',
+    'primary_dark': '#1E3A8A',
+    'primary_light': '#3B82F6',
+    'secondary': '#0891B2',
+    'accent': '#DC2626',
+    'success': '#059669',
+    'warning': '#F59E0B',
+    'background': '#F8FAFC',
+    'surface': '#FFFFFF',
+    'border': '#E2E8F0',
+    'text_primary': '#1E293B',
+    'text_secondary': '#64748B',
+}
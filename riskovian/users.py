@@ -0,0 +1,212 @@
+"""User stores shared by every session in the process.
+
+The SQLite store keeps users in one table keyed by email, so lookups go
+through the primary key index instead of parsing every record. The database
+runs in WAL mode so logins keep reading while a signup is being written, and
+connections are pooled per database file rather than opened on every call.
+
+The JSON store keeps the legacy single-file format. The parsed file is held
+in a process-wide index that is reloaded only when the file changes on disk,
+and writes replace the file atomically under a lock.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Idle connections kept per database file; extra connections are closed on return.
+USER_DB_POOL_SIZE = 8
+USER_DB_TIMEOUT_SECONDS = 10.0
+
+USER_FIELDS = ('password', 'fullname', 'created_at')
+
+_pools = {}
+_pools_lock = threading.Lock()
+_migrated = set()
+
+# path -> (file signature, users) for the JSON store.
+_json_indexes = {}
+_json_lock = threading.RLock()
+
+
+def open_connection(path):
+    """Open a connection to the user database, creating the schema if needed."""
+    conn = sqlite3.connect(path, timeout=USER_DB_TIMEOUT_SECONDS, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS users ("
+        " email TEXT PRIMARY KEY,"
+        " password TEXT NOT NULL,"
+        " fullname TEXT NOT NULL,"
+        " created_at TEXT NOT NULL"
+        ") WITHOUT ROWID"
+    )
+    return conn
+
+def get_pool(path):
+    """Return the process-wide pool of idle connections for ``path``."""
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = queue.LifoQueue(maxsize=USER_DB_POOL_SIZE)
+        return _pools[path]
+
+@contextmanager
+def connect(path):
+    """Borrow a pooled connection and run the block in one transaction.
+
+    The transaction commits when the block exits normally and rolls back if
+    it raises; the connection then goes back to the pool.
+    """
+    pool = get_pool(path)
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = open_connection(path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def migrate_json_users(path, json_path):
+    """Import users from the legacy JSON file once per database.
+
+    The database's ``user_version`` records that the import has run, so the
+    JSON file is read only the first time. Emails already in the database
+    are left untouched.
+    """
+    if path in _migrated:
+        return
+    with connect(path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            if os.path.exists(json_path):
+                with open(json_path, 'r') as f:
+                    legacy_users = json.load(f)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (email, password, fullname, created_at) VALUES (?, ?, ?, ?)",
+                    [(email, *(record[field] for field in USER_FIELDS)) for email, record in legacy_users.items()]
+                )
+            conn.execute("PRAGMA user_version = 1")
+    _migrated.add(path)
+
+def get_user(path, email):
+    """Return one user's record as a dict, or None if the email is unknown."""
+    with connect(path) as conn:
+        row = conn.execute(
+            "SELECT password, fullname, created_at FROM users WHERE email = ?", (email,)
+        ).fetchone()
+    return None if row is None else dict(zip(USER_FIELDS, row))
+
+def add_user(path, email, record):
+    """Insert a new user; returns False if the email is already registered."""
+    try:
+        with connect(path) as conn:
+            conn.execute(
+                "INSERT INTO users (email, password, fullname, created_at) VALUES (?, ?, ?, ?)",
+                (email, *(record[field] for field in USER_FIELDS))
+            )
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+def set_password(path, email, password_hash):
+    """Replace one user's stored password hash."""
+    with connect(path) as conn:
+        conn.execute("UPDATE users SET password = ? WHERE email = ?", (password_hash, email))
+
+def load_users(path):
+    """Return every user as a dict of email -> record."""
+    with connect(path) as conn:
+        rows = conn.execute("SELECT email, password, fullname, created_at FROM users").fetchall()
+    return {row[0]: dict(zip(USER_FIELDS, row[1:])) for row in rows}
+
+def upsert_users(path, users):
+    """Insert or update ``users`` in a single transaction.
+
+    Users that are not in ``users`` are left untouched, so a concurrent
+    signup is never erased by a caller writing back a stale snapshot.
+    """
+    with connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO users (email, password, fullname, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(email) DO UPDATE SET password = excluded.password, "
+            "fullname = excluded.fullname, created_at = excluded.created_at",
+            [(email, *(record[field] for field in USER_FIELDS)) for email, record in users.items()]
+        )
+
+def json_file_signature(path):
+    """Return (inode, mtime, size) for ``path``, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def get_json_index(path):
+    """Return the cached users parsed from ``path``, reloading it if the file changed.
+
+    The returned dict is shared by every session and must not be modified.
+    """
+    with _json_lock:
+        signature = json_file_signature(path)
+        cached = _json_indexes.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        users = {}
+        if signature is not None:
+            with open(path, 'r') as f:
+                users = json.load(f)
+        _json_indexes[path] = (signature, users)
+        return users
+
+def load_json_users(path):
+    """Return a copy of every user in the JSON store."""
+    return dict(get_json_index(path))
+
+def get_json_user(path, email):
+    """Return one user's record from the JSON store, or None if unknown."""
+    return get_json_index(path).get(email)
+
+def save_json_users(path, users):
+    """Atomically replace the JSON store with ``users``.
+
+    The file is written to a temporary file in the same directory and
+    renamed over the original, so readers never see a partial file.
+    """
+    with _json_lock:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(users, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        _json_indexes[path] = (json_file_signature(path), dict(users))
+
+def add_json_user(path, email, record):
+    """Add a user to the JSON store; returns False if the email is already registered."""
+    with _json_lock:
+        users = get_json_index(path)
+        if email in users:
+            return False
+        save_json_users(path, {**users, email: record})
+    return True
+
+def set_json_password(path, email, password_hash):
+    """Replace one user's stored password hash in the JSON store."""
+    with _json_lock:
+        users = get_json_index(path)
+        if email in users:
+            save_json_users(path, {**users, email: {**users[email], 'password': password_hash}})
@@ -0,0 +1,32 @@
+"""Regression tests for request parameter parsing in riskovian.api."""
+
+import pytest
+
+from riskovian.api import ENDPOINTS, parse_params
+
+MONTE_CARLO_PARAMS = ENDPOINTS['/monte-carlo'][1]
+
+
+@pytest.mark.parametrize('raw', [
+    {'horizon': 2.7},
+    {'horizon': '5.5'},
+    {'simulations': 1000.5},
+    {'seed': 1.5},
+    {'seed': True},
+    {'horizon': float('inf')},
+    {'investment_amount': float('nan')},
+    {'investment_amount': True},
+])
+def test_rejects_invalid_numbers(raw):
+    with pytest.raises(ValueError):
+        parse_params(raw, MONTE_CARLO_PARAMS)
+
+def test_integral_numbers_normalize_to_int():
+    from_json = parse_params({'horizon': 5.0, 'simulations': 1000.0, 'seed': 7}, MONTE_CARLO_PARAMS)
+    from_query = parse_params({'horizon': '5', 'simulations': '1000', 'seed': '7'}, MONTE_CARLO_PARAMS)
+    assert from_json == from_query
+    assert isinstance(from_json['horizon'], int)
+
+def test_rejects_unknown_tickers():
+    with pytest.raises(ValueError):
+        parse_params({'tickers': '^NSEI,NOT-A-TICKER'}, ENDPOINTS['/correlation'][1])
@@ -0,0 +1,80 @@
+"""Regression tests for the batch client projections in riskovian.batch."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from riskovian import strategies
+from riskovian.batch import main, project_clients, read_clients
+from riskovian.projections import project_portfolio
+
+
+def test_linearity_matches_project_portfolio():
+    clients = pd.DataFrame({
+        'strategy': ['Moderate', 'Moderate', 'Aggressive'],
+        'investment_amount': [250000.0, 0.0, 10000.0],
+        'horizon': [10, 10, 5],
+        'monthly_contribution': [0.0, 2000.0, 500.0],
+        'goal': [400000.0, np.nan, 60000.0],
+    })
+    percentiles = (5, 50, 95)
+    results = project_clients(clients, num_simulations=2000, seed=7, percentiles=percentiles)
+
+    for _, client in results.iterrows():
+        strategy_data = strategies.get_strategy_data(client['strategy'])
+        projection = project_portfolio(
+            'Parametric', strategy_data['allocation'], strategy_data['expected_return'],
+            strategy_data['volatility'], client['investment_amount'], client['horizon'],
+            client['monthly_contribution'], num_simulations=2000, seed=7
+        )
+        final_values = projection['final_values']
+        for percentile in percentiles:
+            assert client[f'p{percentile}'] == pytest.approx(projection['percentiles'][percentile][-1],
+                                                             rel=1e-9, abs=1e-6)
+        assert client['expected_value'] == pytest.approx(projection['expected_value'], rel=1e-9, abs=1e-6)
+        if np.isnan(client['goal']):
+            assert np.isnan(client['probability_goal'])
+        else:
+            assert client['probability_goal'] == pytest.approx((final_values >= client['goal']).mean())
+
+@pytest.mark.parametrize('column, value', [
+    ('horizon', 0),
+    ('investment_amount', -1.0),
+    ('monthly_contribution', -100.0),
+    ('horizon', None),
+    ('investment_amount', 'lots'),
+    ('horizon', 2.5),
+    ('investment_amount', 'inf'),
+    ('monthly_contribution', '-inf'),
+    ('goal', 'abc'),
+])
+def test_read_clients_rejects_invalid_rows(tmp_path, column, value):
+    clients = pd.DataFrame({
+        'strategy': ['Moderate', 'Moderate'],
+        'investment_amount': [1000.0, 2000.0],
+        'horizon': [5, 10],
+        'monthly_contribution': [100.0, 0.0],
+        'goal': [5000.0, None],
+    })
+    clients[column] = clients[column].astype(object)
+    clients.loc[0, column] = value
+    path = tmp_path / 'clients.csv'
+    clients.to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        read_clients(str(path))
+
+def test_read_clients_allows_blank_goals(tmp_path):
+    path = tmp_path / 'clients.csv'
+    path.write_text("strategy,investment_amount,horizon,monthly_contribution,goal\n"
+                    "Moderate,1000,5,100,\n"
+                    "Aggressive,2000,10.0,0,50000\n")
+    clients = read_clients(str(path))
+    assert clients['horizon'].tolist() == [5, 10]
+    assert np.isnan(clients['goal'][0])
+
+@pytest.mark.parametrize('simulations', ['0', '-5', 'many'])
+def test_main_rejects_invalid_simulation_counts(tmp_path, simulations):
+    path = tmp_path / 'clients.csv'
+    path.write_text("strategy,investment_amount,horizon,monthly_contribution\nModerate,1000,5,100\n")
+    with pytest.raises(SystemExit):
+        main([str(path), str(tmp_path / 'out.csv'), '--assumptions-only', '--simulations', simulations])
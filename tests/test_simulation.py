@@ -0,0 +1,90 @@
+"""Regression tests for the Monte Carlo kernels in riskovian.simulation."""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from riskovian.simulation import (
+    SKETCH_RELATIVE_ACCURACY,
+    compound_paths,
+    run_chunked_simulation,
+    simulate_bootstrap_paths,
+    simulate_portfolio_paths,
+    simulate_strategy_paths,
+)
+
+
+def contribute_then_compound(growth, initial_amount, monthly_contribution):
+    """Reference loop for V_t = (V_{t-1} + c) * (1 + r_t)."""
+    paths = np.empty_like(growth)
+    value = np.full(growth.shape[1:], float(initial_amount))
+    for month in range(growth.shape[0]):
+        value = (value + monthly_contribution) * growth[month]
+        paths[month] = value
+    return paths
+
+@pytest.mark.parametrize('initial_amount, monthly_contribution', [(1000.0, 0.0), (0.0, 50.0), (25000.0, 500.0)])
+def test_compound_paths_matches_loop(initial_amount, monthly_contribution):
+    rng = np.random.default_rng(0)
+    growth = 1 + rng.normal(0.006, 0.05, size=(120, 200))
+    expected = contribute_then_compound(growth, initial_amount, monthly_contribution)
+    paths, final_values = compound_paths(growth.copy(), initial_amount, monthly_contribution)
+    np.testing.assert_allclose(paths, expected, rtol=1e-10)
+    np.testing.assert_allclose(final_values, expected[-1], rtol=1e-10)
+
+def test_compound_paths_leading_axes():
+    rng = np.random.default_rng(1)
+    growth = 1 + rng.normal(0.005, 0.04, size=(3, 60, 50))
+    paths, _ = compound_paths(growth.copy(), 1000.0, 100.0)
+    for row in range(growth.shape[0]):
+        np.testing.assert_allclose(paths[row], contribute_then_compound(growth[row], 1000.0, 100.0),
+                                   rtol=1e-10)
+
+def all_paths(simulate_chunk, num_simulations, seed, chunk_size):
+    """Simulate every path of a chunked run, seeded as run_chunked_simulation seeds it."""
+    chunk_sizes = [min(chunk_size, num_simulations - start)
+                   for start in range(0, num_simulations, chunk_size)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    return np.concatenate([simulate_chunk(num_simulations=size, seed=chunk_seed)[0]
+                           for size, chunk_seed in zip(chunk_sizes, chunk_seeds)], axis=-1)
+
+@pytest.mark.parametrize('simulate_chunk', [
+    partial(simulate_portfolio_paths, 10000.0, 200.0, 120, 0.08, 0.15),
+    partial(simulate_strategy_paths, 10000.0, 200.0, 120, np.array([0.05, 0.08, 0.11]),
+            np.array([0.06, 0.12, 0.2])),
+], ids=['portfolio', 'strategies'])
+def test_sketch_percentiles_match_exact(simulate_chunk):
+    percentiles = (5, 50, 95)
+    summary = run_chunked_simulation(simulate_chunk, 8000, seed=3, percentiles=percentiles,
+                                     chunk_size=2000, workers=1)
+    paths = all_paths(simulate_chunk, 8000, seed=3, chunk_size=2000)
+    exact = np.percentile(paths, percentiles, axis=-1)
+    for index, percentile in enumerate(percentiles):
+        # One bucket of slack on top of the sketch's relative accuracy covers
+        # the rank falling between two samples.
+        np.testing.assert_allclose(summary['percentiles'][percentile], exact[index],
+                                   rtol=3 * SKETCH_RELATIVE_ACCURACY)
+    np.testing.assert_allclose(summary['expected_value'], paths[..., -1, :].mean(axis=-1), rtol=1e-12)
+
+def test_single_chunk_percentiles_are_exact():
+    simulate_chunk = partial(simulate_portfolio_paths, 5000.0, 0.0, 60, 0.07, 0.12)
+    summary = run_chunked_simulation(simulate_chunk, 1500, seed=11, chunk_size=2000, workers=1)
+    paths = all_paths(simulate_chunk, 1500, seed=11, chunk_size=2000)
+    np.testing.assert_array_equal(summary['percentiles'][50], np.percentile(paths, 50, axis=-1))
+    np.testing.assert_array_equal(summary['final_values'], paths[-1])
+
+@pytest.mark.parametrize('simulate_chunk', [
+    partial(simulate_portfolio_paths, 10000.0, 200.0, 60, 0.08, 0.15),
+    partial(simulate_bootstrap_paths, 10000.0, 200.0, 60,
+            np.random.default_rng(5).normal(0.006, 0.04, 96), block_months=12),
+], ids=['portfolio', 'bootstrap'])
+def test_results_independent_of_worker_count(simulate_chunk):
+    kwargs = dict(seed=21, chunk_size=1000, final_threshold=15000.0)
+    serial = run_chunked_simulation(simulate_chunk, 5000, workers=1, **kwargs)
+    parallel = run_chunked_simulation(simulate_chunk, 5000, workers=2, **kwargs)
+    assert serial.keys() == parallel.keys()
+    for key in ('sample_paths', 'final_values', 'expected_value', 'probability_below'):
+        np.testing.assert_array_equal(serial[key], parallel[key])
+    for percentile, band in serial['percentiles'].items():
+        np.testing.assert_array_equal(band, parallel['percentiles'][percentile])